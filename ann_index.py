@@ -0,0 +1,146 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# Index de recherche approximative des plus proches voisins (IVF) sur les
+# vecteurs d'un stock d'embeddings (voir embedding_store), en NumPy seul.
+# Les vecteurs sont normalisés (similarité cosinus), répartis en listes par un
+# k-means sphérique, puis rangés liste par liste de façon contiguë : une requête
+# compare le vecteur aux centroïdes puis ne parcourt que les n_probe listes
+# les plus proches.
+# Fichiers écrits dans le dossier du stock :
+#   ann_centroids.npy : centroïdes (n_lists, 768)
+#   ann_vectors.npy   : vecteurs normalisés, rangés par liste
+#   ann_rows.npy      : ligne du stock de chaque vecteur rangé
+#   ann_offsets.npy   : début de chaque liste dans ann_vectors (n_lists + 1)
+CENTROIDS_FILE = "ann_centroids.npy"
+VECTORS_FILE = "ann_vectors.npy"
+ROWS_FILE = "ann_rows.npy"
+OFFSETS_FILE = "ann_offsets.npy"
+
+N_PROBE = 4
+KMEANS_ITERATIONS = 10
+# Nombre de vecteurs par liste utilisés pour apprendre les centroïdes
+KMEANS_SAMPLES_PER_LIST = 32
+CHUNK_SIZE = 65536
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+# Liste (centroïde le plus proche) de chaque vecteur, calculée par blocs
+def _assign(vectors, centroids, chunk_size=CHUNK_SIZE):
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk_size):
+        chunk = _normalize(vectors[start:start + chunk_size])
+        assignments[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignments
+
+# k-means sphérique sur un échantillon de vecteurs normalisés
+def _kmeans(sample, n_lists, n_iterations, rng):
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)]
+    for _ in range(n_iterations):
+        assignments = _assign(sample, centroids)
+        counts = np.bincount(assignments, minlength=n_lists)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        # Une liste vide (fréquente quand le stock contient des vecteurs
+        # identiques) reçoit un vecteur tiré au hasard
+        empty = counts == 0
+        sums[empty] = sample[rng.choice(len(sample), empty.sum())]
+        centroids = _normalize(sums)
+    return centroids
+
+class IVFIndex:
+    def __init__(self, centroids, vectors, rows, offsets):
+        self.centroids = centroids
+        self.vectors = vectors
+        self.rows = rows
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.rows)
+
+    @classmethod
+    def build(cls, vectors, path=None, n_lists=None, n_iterations=KMEANS_ITERATIONS, seed=0):
+        if len(vectors) == 0:
+            raise ValueError("cannot build an index over an empty set of vectors")
+        rng = np.random.default_rng(seed)
+        # Par défaut 2 * racine(N) listes : environ 500 vecteurs par liste pour un
+        # million ; jamais plus de listes que de vecteurs
+        n_lists = min(n_lists or max(1, int(2 * np.sqrt(len(vectors)))), len(vectors))
+        n_samples = min(len(vectors), n_lists * KMEANS_SAMPLES_PER_LIST)
+        sample = _normalize(vectors[np.sort(rng.choice(len(vectors), n_samples, replace=False))])
+        centroids = _kmeans(sample, n_lists, n_iterations, rng)
+
+        assignments = _assign(vectors, centroids)
+        rows = np.argsort(assignments, kind="stable")
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=n_lists))])
+        if path is None:
+            sorted_vectors = np.empty((len(rows), vectors.shape[1]), dtype=np.float32)
+        else:
+            np.save(os.path.join(path, CENTROIDS_FILE), centroids)
+            np.save(os.path.join(path, ROWS_FILE), rows)
+            np.save(os.path.join(path, OFFSETS_FILE), offsets)
+            sorted_vectors = np.lib.format.open_memmap(os.path.join(path, VECTORS_FILE), mode="w+",
+                                                       dtype=np.float32, shape=(len(rows), vectors.shape[1]))
+        for start in range(0, len(rows), CHUNK_SIZE):
+            sorted_vectors[start:start + CHUNK_SIZE] = _normalize(vectors[rows[start:start + CHUNK_SIZE]])
+        if path is not None:
+            sorted_vectors.flush()
+            return cls.load(path)
+        return cls(centroids, sorted_vectors, rows, offsets)
+
+    @classmethod
+    def load(cls, path):
+        return cls(np.load(os.path.join(path, CENTROIDS_FILE)),
+                   np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r"),
+                   np.load(os.path.join(path, ROWS_FILE)),
+                   np.load(os.path.join(path, OFFSETS_FILE)))
+
+    # k plus proches voisins d'un vecteur : (lignes du stock, similarités cosinus),
+    # du plus proche au plus lointain
+    def search(self, vector, k=5, n_probe=N_PROBE):
+        query = _normalize(vector)
+        n_probe = min(n_probe, len(self.centroids))
+        lists = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+        similarities, positions = [], []
+        for i in lists:
+            start, end = self.offsets[i], self.offsets[i + 1]
+            if end > start:
+                similarities.append(self.vectors[start:end] @ query)
+                positions.append(np.arange(start, end))
+        if not similarities:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        similarities = np.concatenate(similarities)
+        positions = np.concatenate(positions)
+        k = min(k, len(similarities))
+        best = np.argpartition(-similarities, k - 1)[:k]
+        best = best[np.argsort(-similarities[best])]
+        return self.rows[positions[best]], similarities[best]
+
+# Phrases du stock les plus proches d'un texte, avec leurs scores déjà calculés
+def find_similar(text, store, index, k=5, n_probe=N_PROBE):
+    from extract_plongements_camembert import get_embedding
+    rows, similarities = index.search(get_embedding(text), k=k, n_probe=n_probe)
+    return pd.DataFrame({
+        "id": [store.ids[row] for row in rows],
+        "text": [store.texts[row] for row in rows],
+        "similarity": similarities,
+        "score": store.scores[rows],
+    })
+
+def main():
+    from embedding_store import EmbeddingStore
+    parser = argparse.ArgumentParser(description="Construction de l'index IVF d'un stock d'embeddings.")
+    parser.add_argument("store", help="dossier du stock (voir embedding_store)")
+    parser.add_argument("--lists", type=int, help="nombre de listes (par défaut : 2 x racine du nombre de vecteurs)")
+    args = parser.parse_args()
+    store = EmbeddingStore(args.store)
+    index = IVFIndex.build(store.vectors, path=args.store, n_lists=args.lists)
+    print(f"{len(index)} vecteurs, {len(index.centroids)} listes")
+
+if __name__ == "__main__":
+    main()
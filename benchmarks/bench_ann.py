@@ -0,0 +1,67 @@
+# Latence et rappel de l'index IVF (ann_index) sur des vecteurs synthétiques
+# regroupés en grappes, comparés à une recherche exhaustive.
+#
+# Usage : python benchmarks/bench_ann.py [--n 1000000] [--queries 200]
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ann_index import IVFIndex, _normalize
+
+def synthetic_vectors(n, dim, n_clusters, rng):
+    centers = rng.standard_normal((n_clusters, dim), dtype=np.float32)
+    vectors = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 65536):
+        size = min(65536, n - start)
+        labels = rng.integers(n_clusters, size=size)
+        vectors[start:start + size] = centers[labels] + 0.5 * rng.standard_normal((size, dim), dtype=np.float32)
+    return vectors
+
+# Recherche exhaustive par blocs, sans copie normalisée de toute la matrice
+def exact_neighbours(vectors, queries, k, chunk_size=65536):
+    queries = _normalize(queries)
+    best_rows = np.empty((len(queries), 0), dtype=np.int64)
+    best_sims = np.empty((len(queries), 0), dtype=np.float32)
+    for start in range(0, len(vectors), chunk_size):
+        sims = queries @ _normalize(vectors[start:start + chunk_size]).T
+        rows = np.broadcast_to(np.arange(start, start + sims.shape[1]), sims.shape)
+        sims = np.concatenate([best_sims, sims], axis=1)
+        rows = np.concatenate([best_rows, rows], axis=1)
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        best_sims = np.take_along_axis(sims, top, axis=1)
+        best_rows = np.take_along_axis(rows, top, axis=1)
+    return best_rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = synthetic_vectors(args.n, args.dim, max(10, args.n // 200), rng)
+    start = time.perf_counter()
+    index = IVFIndex.build(vectors)
+    print(f"{args.n} vecteurs, {len(index.centroids)} listes, construction {time.perf_counter() - start:.1f} s")
+
+    queries = vectors[rng.choice(args.n, args.queries, replace=False)]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape, dtype=np.float32)
+    # Voisins exacts, calculés à part pour ne pas fausser les mesures de latence
+    exact = exact_neighbours(vectors, queries, args.k)
+    for n_probe in (1, 4, 8, 16):
+        start = time.perf_counter()
+        results = [index.search(query, k=args.k, n_probe=n_probe)[0] for query in queries]
+        elapsed = time.perf_counter() - start
+        hits = sum(len(set(rows) & set(true)) for rows, true in zip(results, exact))
+        print(f"n_probe={n_probe:>2} : {elapsed / args.queries * 1000:.3f} ms/requête, "
+              f"rappel@{args.k} = {hits / (args.queries * args.k):.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Débit de l'encodeur CamemBERT : lots de taille fixe (dans l'ordre des textes)
+# contre lots groupés par longueur sous un budget de jetons
+# (extract_plongements_camembert.length_batches). Les phrases ont des
+# longueurs très variables ; la part de padding de chaque découpage est
+# rapportée avec le débit, ainsi que l'écart maximal des vecteurs par rapport
+# au premier découpage.
+#
+# Usage : python benchmarks/bench_batching.py [--sentences 512] [--repeat 3]
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BATCH_SIZES = [16, 32]
+TOKEN_BUDGETS = [2048, 4096, 8192]
+
+# Part des jetons complétés qui sont du padding
+def padding_ratio(sequences, batches):
+    real = sum(len(seq) for seq in sequences)
+    padded = sum(len(batch) * max(len(sequences[i]) for i in batch) for batch in batches)
+    return 1 - real / padded
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sentences", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    import extract_plongements_camembert as camembert
+    from samples import varied_sentences
+    sentences = varied_sentences(args.sentences)
+    sequences = camembert.get_token_ids(sentences)
+    lengths = [len(seq) for seq in sequences]
+    print(f"{len(sentences)} phrases, {min(lengths)} à {max(lengths)} jetons")
+
+    configs = [(f"fixe {size}", {"batch_size": size},
+                [list(range(start, min(start + size, len(sequences)))) for start in range(0, len(sequences), size)])
+               for size in BATCH_SIZES]
+    configs += [(f"budget {budget}", {"max_tokens": budget}, camembert.length_batches(sequences, budget))
+                for budget in TOKEN_BUDGETS]
+
+    print(f"{'découpage':>12} {'lots':>5} {'padding':>8} {'phrases/s':>10} {'écart':>9}")
+    reference = None
+    camembert.get_embeddings(sentences[:8])  # échauffement
+    for name, kwargs, batches in configs:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            vectors = camembert.get_embeddings(sentences, **kwargs)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        if reference is None:
+            reference = vectors
+        gap = np.abs(vectors - reference).max()
+        print(f"{name:>12} {len(batches):>5} {padding_ratio(sequences, batches):>8.1%} "
+              f"{len(sentences) / elapsed:>10.1f} {gap:>9.2e}")
+
+if __name__ == "__main__":
+    main()
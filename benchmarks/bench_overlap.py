@@ -0,0 +1,51 @@
+# Latence d'une paire : branches lisibilité et embeddings exécutées l'une après
+# l'autre, puis en parallèle par scoring.predict_pair.
+# Chaque passage refait l'analyse spaCy et l'encodage CamemBERT.
+#
+# Usage : python benchmarks/bench_overlap.py [--repeat 20]
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+def sequential(original, simplified):
+    from extract_readability import get_features, diff_readability_features
+    from extract_plongements_camembert import get_embedding, diff_embeddings
+    from scoring import build_features, model
+    emb_df = diff_embeddings(get_embedding(original), get_embedding(simplified))
+    read_df = diff_readability_features(get_features(original), get_features(simplified))
+    return model.predict(build_features(emb_df, read_df))[0]
+
+def overlapped(original, simplified):
+    from scoring import predict_pair
+    return predict_pair(original, simplified)[0]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from samples import PAIRS
+
+    print(f"{'exécution':>12} {'ms/paire':>9} {'p95':>9}")
+    scores = {}
+    for name, run in [("séquentielle", sequential), ("parallèle", overlapped)]:
+        run(*PAIRS[0])
+        timings = []
+        for i in range(args.repeat):
+            original, simplified = PAIRS[i % len(PAIRS)]
+            start = time.perf_counter()
+            scores.setdefault(name, []).append(run(original, simplified))
+            timings.append(time.perf_counter() - start)
+        timings = np.array(timings) * 1000
+        print(f"{name:>12} {timings.mean():>9.1f} {np.percentile(timings, 95):>9.1f}")
+    gap = np.abs(np.array(scores["séquentielle"]) - np.array(scores["parallèle"])).max()
+    print(f"écart maximal des scores : {gap:.2e}")
+
+if __name__ == "__main__":
+    main()
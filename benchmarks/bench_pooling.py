@@ -0,0 +1,82 @@
+# Mesure du pic mémoire et du temps des fonctions de pooling, pour des lots de
+# 1 à 256 phrases. Chaque mesure est faite dans un processus séparé pour que le
+# pic mémoire (ru_maxrss, ou la mémoire CUDA si disponible) ne soit pas faussé
+# par les mesures précédentes.
+#
+# Usage : python benchmarks/bench_pooling.py [--seq-len 128] [--hidden 768]
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BATCH_SIZES = [1, 4, 16, 64, 256]
+STRATEGIES = ["legacy_max", "max", "mean", "cls"]
+
+# Ancienne implémentation, conservée pour comparaison
+def legacy_max_pooling(token_embeddings, attention_mask):
+    import torch
+    mask_expanded = attention_mask.unsqueeze(-1).expand(token_embeddings.size()).to(token_embeddings.dtype)
+    token_embeddings[mask_expanded == 0] = -1e9
+    return torch.max(token_embeddings, dim=1)[0]
+
+def measure(strategy, batch_size, seq_len, hidden, repeats):
+    import resource
+    import time
+    import torch
+    from pooling import POOLINGS
+
+    pooling = legacy_max_pooling if strategy == "legacy_max" else POOLINGS[strategy]
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    torch.manual_seed(0)
+    embeddings = torch.randn(batch_size, seq_len, hidden, device=device)
+    # Longueurs variables pour simuler un lot complété
+    lengths = torch.randint(1, seq_len + 1, (batch_size,), device=device)
+    mask = (torch.arange(seq_len, device=device)[None, :] < lengths[:, None]).long()
+    # Échauffement sur un petit lot, pour ne pas atteindre le pic avant la mesure
+    pooling(embeddings[:1, :2].clone(), mask[:1, :2])
+
+    if device.type == "cuda":
+        torch.cuda.synchronize()
+        torch.cuda.reset_peak_memory_stats()
+        base = torch.cuda.max_memory_allocated()
+    else:
+        base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    start = time.perf_counter()
+    for _ in range(repeats):
+        pooling(embeddings, mask)
+    if device.type == "cuda":
+        torch.cuda.synchronize()
+        peak = torch.cuda.max_memory_allocated()
+    else:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"{peak - base} {elapsed}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seq-len", type=int, default=128)
+    parser.add_argument("--hidden", type=int, default=768)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure(args.child[0], int(args.child[1]), args.seq_len, args.hidden, args.repeats)
+        return
+
+    input_mb = lambda b: b * args.seq_len * args.hidden * 4 / 2**20
+    print(f"{'pooling':<11} {'batch':>5} {'input MB':>9} {'peak extra MB':>14} {'ms':>8}")
+    for batch_size in BATCH_SIZES:
+        for strategy in STRATEGIES:
+            out = subprocess.run(
+                [sys.executable, __file__, "--seq-len", str(args.seq_len), "--hidden", str(args.hidden),
+                 "--repeats", str(args.repeats), "--child", strategy, str(batch_size)],
+                capture_output=True, text=True, check=True).stdout.split()
+            extra, elapsed = int(out[0]), float(out[1])
+            print(f"{strategy:<11} {batch_size:>5} {input_mb(batch_size):>9.1f} {extra / 2**20:>14.1f} {elapsed * 1000:>8.2f}")
+
+if __name__ == "__main__":
+    main()
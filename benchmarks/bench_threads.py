@@ -0,0 +1,78 @@
+# Débit de l'encodeur CamemBERT selon la répartition des cœurs entre
+# processus workers et threads torch. Pour un nombre de cœurs donné, chaque
+# configuration (workers x threads) encode le même nombre total de phrases ;
+# la configuration au meilleur débit est affichée à la fin.
+#
+# Usage : python benchmarks/bench_threads.py [--cores 8] [--sentences 256]
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from inference_config import available_cores, partition_cores, pin_worker
+
+def _worker(index, n_workers, cores, threads, sentences, batch_size, barrier, results):
+    if threads is None:
+        pin_worker(index, n_workers, cores)
+    else:
+        # Configuration « naïve » : pas d'attache, threads fixés à la main
+        import torch
+        torch.set_num_threads(threads)
+    import extract_plongements_camembert as camembert
+    camembert.get_embeddings(sentences[:batch_size], batch_size=batch_size)  # échauffement
+    barrier.wait()
+    start = time.perf_counter()
+    camembert.get_embeddings(sentences, batch_size=batch_size)
+    results.put(time.perf_counter() - start)
+
+def run(n_workers, cores, sentences, batch_size, threads=None):
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(n_workers)
+    results = ctx.Queue()
+    shards = [sentences[i::n_workers] for i in range(n_workers)]
+    procs = [ctx.Process(target=_worker, args=(i, n_workers, cores, threads, shards[i], batch_size, barrier, results))
+             for i in range(n_workers)]
+    for proc in procs:
+        proc.start()
+    elapsed = max(results.get() for _ in procs)
+    for proc in procs:
+        proc.join()
+    return len(sentences) / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cores", type=int, default=len(available_cores()))
+    parser.add_argument("--sentences", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    from samples import varied_sentences
+    cores = available_cores()[:args.cores]
+    sentences = varied_sentences(args.sentences)
+
+    configs = []
+    n_workers = 1
+    while n_workers <= len(cores):
+        configs.append((n_workers, None))
+        n_workers *= 2
+    # Référence : plusieurs workers non attachés, chacun avec autant de threads
+    # que de cœurs (situation de plusieurs sessions sans réglage)
+    configs.append((min(4, len(cores)), len(cores)))
+
+    print(f"{len(cores)} cœurs, {len(sentences)} phrases, lots de {args.batch_size}")
+    print(f"{'workers':>7} {'threads/worker':>14} {'pinned':>6} {'phrases/s':>10}")
+    best = None
+    for n_workers, threads in configs:
+        throughput = run(n_workers, cores, sentences, args.batch_size, threads)
+        per_worker = threads or len(partition_cores(n_workers, cores)[0])
+        print(f"{n_workers:>7} {per_worker:>14} {'non' if threads else 'oui':>6} {throughput:>10.1f}")
+        if best is None or throughput > best[0]:
+            best = (throughput, n_workers, per_worker)
+    print(f"Meilleure configuration : {best[1]} worker(s) x {best[2]} thread(s) ({best[0]:.1f} phrases/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Compromis précision / latence entre les niveaux de score « accurate »
+# (CamemBERT-base) et « fast » (encodeur distillé, voir fast_tier). Les deux
+# niveaux évaluent les mêmes paires ; l'écart au niveau accurate est rapporté,
+# ainsi que l'erreur par rapport aux scores attendus si le fichier en contient
+# (colonne score).
+#
+# Usage : python benchmarks/bench_tiers.py [--pairs paires.csv] [--repeat 3]
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+TIERS = ["accurate", "fast"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", help="fichier CSV de paires (original, simplified, et éventuellement score)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    import scoring
+    if args.pairs:
+        pairs = pd.read_csv(args.pairs)
+    else:
+        from samples import PAIRS
+        pairs = pd.DataFrame(PAIRS, columns=["original", "simplified"])
+
+    results = {}
+    for tier in TIERS:
+        # Premier passage hors mesure : chargement des modèles
+        scoring.score_pairs(pairs["original"][:2], pairs["simplified"][:2], tier=tier)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            scored = scoring.score_pairs(pairs["original"], pairs["simplified"], tier=tier)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        results[tier] = (scored["score"].to_numpy(), elapsed)
+
+    reference = results["accurate"][0]
+    print(f"{len(pairs)} paires")
+    print(f"{'niveau':>8} {'ms/paire':>9} {'écart moyen':>12} {'corrélation':>12} {'erreur/cible':>13}")
+    for tier, (scores, elapsed) in results.items():
+        gap = np.abs(scores - reference).mean()
+        corr = np.corrcoef(scores, reference)[0, 1] if len(scores) > 1 else float("nan")
+        target = (f"{np.abs(scores - pairs['score'].to_numpy()).mean():>13.3f}"
+                  if "score" in pairs else f"{'-':>13}")
+        print(f"{tier:>8} {elapsed / len(pairs) * 1000:>9.2f} {gap:>12.3f} {corr:>12.3f} {target}")
+
+if __name__ == "__main__":
+    main()
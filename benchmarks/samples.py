@@ -0,0 +1,29 @@
+# Paires (originale, simplifiée) représentatives pour les benchmarks
+PAIRS = [
+    ("Le gouvernement a annoncé hier une série de mesures destinées à réduire la consommation d'énergie des bâtiments publics.",
+     "Le gouvernement veut que les bâtiments publics consomment moins d'énergie."),
+    ("Malgré les avertissements répétés des météorologues, de nombreux randonneurs se sont aventurés sur les sentiers enneigés.",
+     "Beaucoup de randonneurs sont partis dans la neige. Pourtant, la météo était mauvaise."),
+    ("La commission a estimé que les conditions nécessaires à l'ouverture de l'établissement n'étaient pas réunies.",
+     "La commission refuse l'ouverture du bâtiment."),
+    ("Les chercheurs ont observé une diminution significative de la population d'abeilles dans les régions agricoles intensives.",
+     "Il y a moins d'abeilles près des grandes cultures."),
+    ("Afin de faciliter l'accès aux soins, la municipalité a inauguré un centre de santé pluridisciplinaire au cœur du quartier.",
+     "La ville a ouvert un centre de santé dans le quartier."),
+    ("Le tribunal administratif a suspendu l'arrêté préfectoral interdisant les rassemblements sur la voie publique.",
+     "Le juge a annulé l'interdiction de se réunir dans la rue."),
+    ("L'élève, qui n'avait pas compris les consignes de l'exercice, a demandé des explications supplémentaires à son enseignante.",
+     "L'élève n'a pas compris l'exercice. Il a posé une question à sa maîtresse."),
+    ("Les intempéries ont provoqué d'importantes perturbations sur l'ensemble du réseau ferroviaire régional.",
+     "À cause du mauvais temps, beaucoup de trains sont en retard."),
+]
+
+SENTENCES = [text for pair in PAIRS for text in pair]
+
+# Jeu de phrases de longueurs variées (de quelques mots à un long paragraphe)
+def varied_sentences(n):
+    sentences = []
+    for i in range(n):
+        repeat = 1 + (i * 7) % 12
+        sentences.append(" ".join(SENTENCES[j % len(SENTENCES)] for j in range(i, i + repeat)))
+    return sentences
@@ -0,0 +1,80 @@
+# Écart des scores du MLP entre le chemin de référence float64 et les chemins
+# en précision réduite (float32, float16), mesuré sur le chemin de production.
+# Avec des paires, chaque précision passe par scoring.score_pairs(dtype=...).
+# En mode synthétique (sans l'encodeur), des vecteurs d'originales et de
+# simplifiées sont tirés puis passent par scoring.embedding_diffs et
+# build_features, comme dans score_pairs. Le script échoue (code 1) si l'écart
+# maximal dépasse la tolérance.
+#
+# Usage : python benchmarks/validate_precision.py [--pairs paires.csv] [--tolerance 0.01]
+#         python benchmarks/validate_precision.py --synthetic 10000
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+DTYPES = ["float32", "float16"]
+
+# Vecteurs d'originales et de simplifiées tirés pour valider sans l'encodeur :
+# les vecteurs max-poolés de CamemBERT sont décalés (moyenne positive), et
+# leurs différences suivent la distribution apprise par la PCA
+EMBEDDING_OFFSET = 1.5
+
+def synthetic_vectors(pca, n, rng):
+    dim = pca.components_.shape[1]
+    ori = rng.normal(EMBEDDING_OFFSET, 0.5, (n, dim))
+    z = rng.standard_normal((n, pca.n_components_)) * np.sqrt(pca.explained_variance_)
+    sim = ori + pca.mean_ + z @ pca.components_
+    return ori.astype(np.float32), sim.astype(np.float32)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", help="fichier CSV de paires (colonnes original, simplified)")
+    parser.add_argument("--synthetic", type=int, help="nombre de paires de vecteurs synthétiques")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="écart maximal toléré sur le score")
+    args = parser.parse_args()
+
+    import scoring
+    from extract_readability import DIFF_COLUMNS, diff_pair_matrix
+
+    if args.pairs:
+        pairs = pd.read_csv(args.pairs)
+        originals, simplifieds = pairs["original"].tolist(), pairs["simplified"].tolist()
+    else:
+        from samples import PAIRS
+        originals, simplifieds = [p[0] for p in PAIRS], [p[1] for p in PAIRS]
+
+    if args.synthetic:
+        rng = np.random.default_rng(0)
+        ori, sim = synthetic_vectors(scoring.pca, args.synthetic, rng)
+        read_df = pd.DataFrame(diff_pair_matrix(originals, simplifieds), columns=DIFF_COLUMNS)
+        read_df = read_df.iloc[rng.integers(len(read_df), size=args.synthetic)].reset_index(drop=True)
+
+        def score(dtype):
+            emb_df = scoring.embedding_diffs(ori, sim, dtype)
+            return scoring.model.predict(scoring.build_features(emb_df, read_df, dtype)), emb_df
+    else:
+        def score(dtype):
+            scored = scoring.score_pairs(originals, simplifieds, dtype=dtype, tier="accurate")
+            return scored["score"].to_numpy(), None
+
+    reference, _ = score("float64")
+    print(f"{len(reference)} paires, scores de référence dans [{np.nanmin(reference):.2f}, {np.nanmax(reference):.2f}]")
+    failed = False
+    for dtype in DTYPES:
+        scores, emb_df = score(dtype)
+        error = np.abs(scores - reference)
+        ok = np.nanmax(error) <= args.tolerance
+        failed |= not ok
+        memory = f", mémoire embeddings {emb_df.memory_usage(index=False).sum() / 2**20:.1f} Mo" if emb_df is not None else ""
+        print(f"{dtype:>8} : écart max {np.nanmax(error):.2e}, moyen {np.nanmean(error):.2e}{memory}"
+              f" -> {'OK' if ok else 'HORS TOLÉRANCE'}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
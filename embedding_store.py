@@ -0,0 +1,118 @@
+import argparse
+import csv
+import os
+import joblib
+import numpy as np
+import pandas as pd
+
+# Stock d'embeddings précalculés pour un corpus de référence.
+# Un stock est un dossier contenant :
+#   vectors.npy : vecteurs CamemBERT max-poolés, matrice (N, 768) float32
+#                 (ou float16 avec --dtype float16, deux fois plus compact)
+#   pca.npy     : projections PCA de ces vecteurs (optionnel), même précision
+#   index.csv   : colonnes id, text (et score si des scores sont connus) ;
+#                 la ligne i décrit le vecteur i
+# Les matrices sont ouvertes en mémoire projetée (mmap) : plusieurs processus
+# lisant le même stock partagent les mêmes pages, sans copie.
+VECTORS_FILE = "vectors.npy"
+PCA_FILE = "pca.npy"
+INDEX_FILE = "index.csv"
+
+# Nombre de phrases encodées puis écrites sur disque à la fois
+CHUNK_SIZE = 1024
+
+class EmbeddingStore:
+    def __init__(self, path):
+        self.path = path
+        self.vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+        pca_path = os.path.join(path, PCA_FILE)
+        self.pca_vectors = np.load(pca_path, mmap_mode="r") if os.path.exists(pca_path) else None
+        with open(os.path.join(path, INDEX_FILE), newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.ids = [row["id"] for row in rows]
+        self.texts = [row["text"] for row in rows]
+        # Scores déjà calculés pour ces phrases (NaN si inconnus)
+        self.scores = np.array([float(row.get("score") or "nan") for row in rows])
+        self._rows_by_text = {text: i for i, text in enumerate(self.texts)}
+        self._rows_by_id = {id_: i for i, id_ in enumerate(self.ids)}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, text):
+        return text in self._rows_by_text
+
+    # Vecteur stocké pour un texte, ou None s'il n'est pas dans le corpus
+    def get(self, text):
+        row = self._rows_by_text.get(text)
+        return None if row is None else self.vectors[row]
+
+    def get_by_id(self, id_):
+        return self.vectors[self._rows_by_id[id_]]
+
+    def get_pca(self, text):
+        row = self._rows_by_text.get(text)
+        if row is None or self.pca_vectors is None:
+            return None
+        return self.pca_vectors[row]
+
+# Calcul et écriture d'un stock : les vecteurs sont écrits par blocs dans la
+# matrice projetée, sans garder tout le corpus en mémoire
+def build_store(texts, path, ids=None, pca=None, scores=None, dtype=np.float32, chunk_size=CHUNK_SIZE):
+    from extract_plongements_camembert import get_embeddings, model
+
+    texts = list(texts)
+    ids = [str(i) for i in range(len(texts))] if ids is None else [str(i) for i in ids]
+    if len(ids) != len(texts):
+        raise ValueError("ids and texts must have the same length")
+    os.makedirs(path, exist_ok=True)
+
+    vectors = np.lib.format.open_memmap(os.path.join(path, VECTORS_FILE), mode="w+",
+                                        dtype=dtype, shape=(len(texts), model.config.hidden_size))
+    pca_vectors = None
+    if pca is not None:
+        pca_vectors = np.lib.format.open_memmap(os.path.join(path, PCA_FILE), mode="w+",
+                                                dtype=dtype, shape=(len(texts), pca.n_components_))
+    for start in range(0, len(texts), chunk_size):
+        chunk = get_embeddings(texts[start:start + chunk_size])
+        vectors[start:start + len(chunk)] = chunk
+        if pca_vectors is not None:
+            pca_vectors[start:start + len(chunk)] = pca.transform(
+                pd.DataFrame(chunk, columns=[f"max_{i}" for i in range(chunk.shape[1])]))
+    vectors.flush()
+    if pca_vectors is not None:
+        pca_vectors.flush()
+
+    with open(os.path.join(path, INDEX_FILE), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if scores is None:
+            writer.writerow(["id", "text"])
+            writer.writerows(zip(ids, texts))
+        else:
+            writer.writerow(["id", "text", "score"])
+            writer.writerows(zip(ids, texts, scores))
+    return EmbeddingStore(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Précalcul des embeddings CamemBERT d'un corpus de phrases originales.")
+    parser.add_argument("corpus", help="fichier CSV du corpus")
+    parser.add_argument("store", help="dossier de sortie")
+    parser.add_argument("--text-column", default="original")
+    parser.add_argument("--id-column", help="colonne d'identifiants (par défaut : numéro de ligne)")
+    parser.add_argument("--score-column", help="colonne de scores déjà calculés à conserver dans l'index")
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32",
+                        help="précision des matrices stockées (défaut : %(default)s)")
+    parser.add_argument("--pca", nargs="?", const="pca_model_max_rev.pkl",
+                        help="stocker aussi les projections PCA (modèle par défaut : %(const)s)")
+    args = parser.parse_args()
+
+    corpus = pd.read_csv(args.corpus)
+    texts = corpus[args.text_column].astype(str).drop_duplicates()
+    ids = corpus.loc[texts.index, args.id_column] if args.id_column else texts.index
+    scores = corpus.loc[texts.index, args.score_column].tolist() if args.score_column else None
+    pca = joblib.load(args.pca) if args.pca else None
+    store = build_store(texts.tolist(), args.store, ids=ids.tolist(), pca=pca, scores=scores, dtype=args.dtype)
+    print(f"{len(store)} phrases -> {args.store}")
+
+if __name__ == "__main__":
+    main()
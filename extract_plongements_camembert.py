@@ -1,6 +1,14 @@
+import threading
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 import torch
 from transformers import AutoTokenizer, AutoModel
+from pooling import max_pooling
+from inference_config import configure_threads
+
+# Threads de torch (voir inference_config pour les variables d'environnement)
+configure_threads()
 
 # Chargement du modèle CamemBERT
 model_name = "camembert-base"
@@ -8,29 +16,149 @@ tokenizer = AutoTokenizer.from_pretrained(model_name)
 model = AutoModel.from_pretrained(model_name)
 model.eval()
 
+# Lots groupés par longueur : nombre maximal de jetons complétés par passe
+# (nombre de phrases × longueur de la plus longue)
+MAX_BATCH_TOKENS = 4096
+
+# Textes longs : taille des fenêtres (jetons spéciaux compris), recouvrement
+# entre fenêtres successives et nombre maximal de fenêtres encodées ensemble
+MAX_LENGTH = min(tokenizer.model_max_length, 512)
+WINDOW_OVERLAP = 128
+MAX_WINDOW_BATCH = 8
+
+# Nombre maximal de phrases dont les identifiants de tokens sont gardés en cache
+TOKEN_CACHE_SIZE = 10000
+
 # Utilisation du GPU si disponible
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 model.to(device)
 
-# Fonction de max pooling sur les embeddings de tokens
-def max_pooling(token_embeddings, attention_mask):
-    mask_expanded = attention_mask.unsqueeze(-1).expand(token_embeddings.size()).to(token_embeddings.dtype)
-    token_embeddings[mask_expanded == 0] = -1e9
-    return torch.max(token_embeddings, dim=1)[0]
+# Cache LRU des identifiants de tokens (texte -> liste d'identifiants)
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
 
-# Extraction d'un vecteur de phrase avec max pooling
-def get_embedding(text):
-    inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True).to(device)
+# Identifiants de tokens d'une liste de textes : les textes absents du cache
+# sont tokenisés en un seul appel au tokenizer rapide
+def get_token_ids(texts):
+    ids = {}
+    missing = []
+    with _token_cache_lock:
+        for text in dict.fromkeys(texts):
+            if text in _token_cache:
+                _token_cache.move_to_end(text)
+                ids[text] = _token_cache[text]
+            else:
+                missing.append(text)
+    if missing:
+        encoded = tokenizer(missing, truncation=True)["input_ids"]
+        ids.update(zip(missing, encoded))
+        with _token_cache_lock:
+            _token_cache.update(zip(missing, encoded))
+            while len(_token_cache) > TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    return [ids[text] for text in texts]
+
+# Construction directe des tenseurs complétés (padding à droite)
+def pad_token_ids(sequences):
+    max_len = max(len(ids) for ids in sequences)
+    input_ids = np.full((len(sequences), max_len), tokenizer.pad_token_id, dtype=np.int64)
+    attention_mask = np.zeros((len(sequences), max_len), dtype=np.int64)
+    for i, ids in enumerate(sequences):
+        input_ids[i, :len(ids)] = ids
+        attention_mask[i, :len(ids)] = 1
+    return {
+        "input_ids": torch.from_numpy(input_ids).to(device),
+        "attention_mask": torch.from_numpy(attention_mask).to(device),
+    }
+
+# Passe du modèle sur des séquences d'identifiants, suivie du max pooling
+def encode_token_ids(sequences):
+    inputs = pad_token_ids(sequences)
     with torch.no_grad():
         outputs = model(**inputs)
-        token_embeddings = outputs.last_hidden_state
-        attention_mask = inputs["attention_mask"]
-        pooled = max_pooling(token_embeddings, attention_mask)
-    return pooled.squeeze().cpu().numpy()
+        return max_pooling(outputs.last_hidden_state, inputs["attention_mask"])
+
+# Extraction d'un vecteur de phrase avec max pooling
+# Avec long_input=True, le texte n'est pas tronqué à MAX_LENGTH jetons
+def get_embedding(text, long_input=False):
+    if long_input:
+        return get_long_embedding(text)
+    return encode_token_ids(get_token_ids([text]))[0].cpu().numpy()
+
+# Extraction d'un vecteur pour un texte long : le texte est découpé en fenêtres
+# qui se recouvrent, encodées par lots, puis le max pooling est appliqué sur
+# l'ensemble des fenêtres
+def get_long_embedding(text, overlap=WINDOW_OVERLAP):
+    ids = tokenizer(text, add_special_tokens=False)["input_ids"]
+    size = MAX_LENGTH - 2  # <s> ... </s>
+    if len(ids) <= size:
+        return get_embedding(text)
+    step = size - overlap
+    windows = [[tokenizer.cls_token_id] + ids[start:start + size] + [tokenizer.sep_token_id]
+               for start in range(0, len(ids) - overlap, step)]
+
+    # La taille des lots s'adapte au nombre de fenêtres pour borner la mémoire
+    batch_size = min(len(windows), MAX_WINDOW_BATCH)
+    pooled = [encode_token_ids(windows[start:start + batch_size])
+              for start in range(0, len(windows), batch_size)]
+    return torch.cat(pooled).max(dim=0)[0].cpu().numpy()
+
+# Découpage en lots groupés par longueur : les séquences sont triées par
+# longueur puis regroupées tant que le lot complété reste sous max_tokens
+# jetons ; une séquence plus longue que le budget forme un lot à elle seule.
+# Renvoie les indices des séquences de chaque lot.
+def length_batches(sequences, max_tokens=MAX_BATCH_TOKENS):
+    order = sorted(range(len(sequences)), key=lambda i: len(sequences[i]))
+    batches, batch = [], []
+    for i in order:
+        # L'ordre croissant fait de la séquence ajoutée la plus longue du lot
+        if batch and (len(batch) + 1) * len(sequences[i]) > max_tokens:
+            batches.append(batch)
+            batch = []
+        batch.append(i)
+    if batch:
+        batches.append(batch)
+    return batches
+
+# Extraction des vecteurs de plusieurs phrases, dans l'ordre des textes.
+# Par défaut les phrases sont encodées par lots groupés par longueur (voir
+# length_batches), ce qui limite le padding quand les longueurs varient ; avec
+# batch_size, elles sont encodées par lots de taille fixe dans l'ordre donné.
+def get_embeddings(texts, batch_size=None, max_tokens=MAX_BATCH_TOKENS):
+    sequences = get_token_ids(list(texts))
+    vectors = np.empty((len(sequences), model.config.hidden_size), dtype=np.float32)
+    if batch_size:
+        batches = [list(range(start, min(start + batch_size, len(sequences))))
+                   for start in range(0, len(sequences), batch_size)]
+    else:
+        batches = length_batches(sequences, max_tokens)
+    for batch in batches:
+        vectors[batch] = encode_token_ids([sequences[i] for i in batch]).cpu().numpy()
+    return vectors
+
+# Vecteur de la phrase originale, lu dans un stock précalculé (voir
+# embedding_store) quand elle y figure
+def get_original_embedding(original, store=None, long_input=False):
+    if store is not None:
+        vec = store.get(original)
+        if vec is not None:
+            return np.asarray(vec)
+    return get_embedding(original, long_input=long_input)
 
 # Calcul de la différence d'embedding entre deux phrases
-def extract_camembert_diff(original, simplified):
-    ori_vec = get_embedding(original)
-    sim_vec = get_embedding(simplified)
-    diff_vec = sim_vec - ori_vec
-    return pd.DataFrame([diff_vec], columns=[f"max_{i}" for i in range(len(diff_vec))])
\ No newline at end of file
+def extract_camembert_diff(original, simplified, long_input=False, store=None):
+    ori_vec = get_original_embedding(original, store, long_input=long_input)
+    sim_vec = get_embedding(simplified, long_input=long_input)
+    return diff_embeddings(ori_vec, sim_vec)
+
+# Différence à partir des vecteurs déjà calculés de chaque phrase ; accepte
+# aussi des matrices (une ligne par paire)
+def diff_embeddings(ori_vec, sim_vec):
+    diff_mat = np.atleast_2d(sim_vec - ori_vec)
+    return pd.DataFrame(diff_mat, columns=[f"max_{i}" for i in range(diff_mat.shape[1])])
+
+# Différences d'embedding entre une phrase originale et plusieurs candidates :
+# l'originale n'est encodée qu'une seule fois
+def extract_camembert_diffs(original, candidates, store=None):
+    ori_vec = get_original_embedding(original, store)
+    return diff_embeddings(ori_vec, get_embeddings(candidates))
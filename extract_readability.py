@@ -5,6 +5,24 @@ import spacy
 import os
 import subprocess
 import sys
+from collections import OrderedDict
+
+# Mesures conservées, dans l'ordre des colonnes diff_* attendu par le modèle
+FEATURES = [
+    'LIX', 'RIX', 'REL', 'KandelMoles', 'Mesnager',
+    'characters_per_word', 'syll_per_word', 'words_per_sentence',
+    'sentences_per_paragraph', 'type_token_ratio', 'directspeech_ratio',
+    'characters', 'syllables', 'words', 'wordtypes', 'sentences',
+    'long_words', 'complex_words', 'complex_words_mes',
+    'tobeverb', 'auxverb', 'conjunction', 'preposition', 'nominalization',
+    'subordination', 'article', 'pronoun', 'interrogative',
+]
+
+DIFF_COLUMNS = [f"diff_{name}" for name in FEATURES]
+
+# Erreurs d'une paire qui ne peut pas être évaluée (voir pair_errors)
+EMPTY_TEXT = "texte vide"
+NO_WORDS = "aucun mot"
 
 # Global nlp instance
 _nlp = None
@@ -23,32 +41,95 @@ def get_nlp():
 # Extraction des mesures de lisibilité
 def get_features(text, lang='fr'):
     nlp = get_nlp()
-    doc = nlp(text)
-    
+    return get_doc_features(nlp(text), lang=lang)
+
+# Mesures de lisibilité d'un texte déjà analysé par spaCy, sous forme
+# d'enregistrement readability.Measures (toutes les mesures de la langue)
+def get_doc_measures(doc, lang='fr'):
     # Reformater le texte
     tokenized = '\n\n'.join(' '.join(token.text for token in sent) for sent in doc.sents)
-    results = readability.getmeasures(tokenized, lang=lang, merge=True)
-    
-    # Supprimer les mesures qu'on n'utilise pas
-    for key in [
-        'Kincaid', 'ARI', 'Coleman-Liau', 'FleschReadingEase',
-        'GunningFogIndex', 'SMOGIndex', 'DaleChallIndex',
-        'paragraphs', 'complex_words_dc'
-    ]:
-        results.pop(key, None)
-    return results
+    return readability.getmeasures(tokenized, lang=lang, record=True)
+
+# Mesures de lisibilité d'un texte déjà analysé par spaCy, réduites à celles
+# qu'utilise le modèle (FEATURES)
+def get_doc_features(doc, lang='fr'):
+    measures = get_doc_measures(doc, lang=lang)
+    return OrderedDict((name, measures[name]) for name in FEATURES if name in measures)
+
+# Mesures de lisibilité de plusieurs textes, analysés par lots avec nlp.pipe
+def get_features_many(texts, lang='fr'):
+    nlp = get_nlp()
+    return [get_doc_features(doc, lang=lang) for doc in nlp.pipe(texts)]
+
+# Matrice des mesures FEATURES de plusieurs textes (une ligne par texte),
+# remplie directement depuis les enregistrements readability.Measures. Un
+# texte vide ou sans aucun mot, que readability refuse, a une ligne de NaN.
+def get_feature_matrix(texts, lang='fr'):
+    nlp = get_nlp()
+    texts = list(texts)
+    columns = [readability.getschema(lang).index[name] for name in FEATURES]
+    matrix = np.empty((len(texts), len(FEATURES)))
+    for row, doc in zip(matrix, nlp.pipe(texts)):
+        try:
+            row[:] = np.frombuffer(get_doc_measures(doc, lang=lang).array)[columns]
+        except ValueError:
+            row[:] = np.nan
+    return matrix
+
+# Différences de lisibilité (simplifiée - originale) d'une liste de paires,
+# une ligne par paire : chaque texte distinct n'est analysé qu'une fois, et
+# une paire identique vaut 0 sans être analysée. Une paire dont un texte est
+# vide ou ne contient aucun mot a une ligne de NaN.
+def diff_pair_matrix(originals, simplifieds, lang='fr'):
+    originals, simplifieds = list(originals), list(simplifieds)
+    diffs = np.zeros((len(originals), len(FEATURES)))
+    blank = np.array([not (o.strip() and s.strip()) for o, s in zip(originals, simplifieds)], dtype=bool)
+    changed = np.array([o.strip() != s.strip() for o, s in zip(originals, simplifieds)], dtype=bool) & ~blank
+    diffs[blank] = np.nan
+    if changed.any():
+        ori_texts = [text for text, keep in zip(originals, changed) if keep]
+        sim_texts = [text for text, keep in zip(simplifieds, changed) if keep]
+        texts = list(dict.fromkeys(ori_texts + sim_texts))
+        rows = {text: i for i, text in enumerate(texts)}
+        feats = get_feature_matrix(texts, lang=lang)
+        diffs[changed] = feats[[rows[text] for text in sim_texts]] - feats[[rows[text] for text in ori_texts]]
+    return diffs
+
+# Erreur de chaque paire d'après sa ligne de différences (diff_pair_matrix) :
+# None si la paire peut être évaluée, sinon EMPTY_TEXT ou NO_WORDS
+def pair_errors(originals, simplifieds, diffs):
+    return [None if not np.isnan(row).any()
+            else EMPTY_TEXT if not (original.strip() and simplified.strip()) else NO_WORDS
+            for original, simplified, row in zip(originals, simplifieds, diffs)]
+
+# Matrice des mesures FEATURES à partir de mesures déjà calculées
+# (dictionnaires renvoyés par get_features)
+def feature_matrix(feats):
+    matrix = np.empty((len(feats), len(FEATURES)))
+    for row, values in zip(matrix, feats):
+        row[:] = [values[name] for name in FEATURES]
+    return matrix
+
+# Différences (simplifiée - originale) entre deux matrices de mesures, une
+# ligne par paire : une seule soustraction et un seul DataFrame par lot. Une
+# matrice d'une ligne est appliquée à toutes les lignes de l'autre.
+def diff_feature_matrices(ori, sim):
+    return pd.DataFrame(np.atleast_2d(sim - ori), columns=DIFF_COLUMNS)
 
 # Calcul des différences de lisibilité entre deux phrases
 def extract_readability_features(original, simplified):
-    ori_feats = get_features(original)
-    sim_feats = get_features(simplified)
-    
-    # Convertir les résultats en Series pandas
-    ori_df = pd.Series(ori_feats)
-    sim_df = pd.Series(sim_feats)
-    
-    # Calcul de la différence (simplifiée - originale)
-    diff_df = sim_df - ori_df
-    diff_df = diff_df.add_prefix("diff_")
-    
-    return pd.DataFrame([diff_df])
+    return diff_readability_features(get_features(original), get_features(simplified))
+
+# Différence de lisibilité à partir des mesures déjà calculées de chaque phrase
+def diff_readability_features(ori_feats, sim_feats):
+    return diff_feature_matrices(feature_matrix([ori_feats]), feature_matrix([sim_feats]))
+
+# Différences de lisibilité entre une phrase originale et plusieurs candidates :
+# l'originale n'est analysée qu'une seule fois, les candidates passent par nlp.pipe
+def extract_readability_features_many(original, candidates):
+    return diff_feature_matrices(feature_matrix([get_features(original)]), get_feature_matrix(candidates))
+
+# Différences de lisibilité pour des listes de mesures déjà calculées, une
+# ligne par paire
+def diff_readability_features_many(ori_feats, sim_feats):
+    return diff_feature_matrices(feature_matrix(ori_feats), feature_matrix(sim_feats))
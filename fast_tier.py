@@ -0,0 +1,104 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+import torch
+from transformers import AutoTokenizer, AutoModel
+from pooling import max_pooling
+
+# Niveau de score rapide : un encodeur français plus petit (DistilCamemBERT
+# par défaut) remplace CamemBERT-base. Ses vecteurs max-poolés sont projetés
+# dans l'espace des vecteurs CamemBERT par une application linéaire apprise
+# localement (régression ridge, distillation des caractéristiques), si bien
+# que la PCA et le MLP existants sont réutilisés tels quels.
+#
+#   python fast_tier.py pairs.csv   (apprend fast_tier_projection.npz)
+FAST_MODEL_NAME = os.environ.get("FAST_MODEL_NAME", "cmarkea/distilcamembert-base")
+PROJECTION_PATH = "fast_tier_projection.npz"
+BATCH_SIZE = 64
+RIDGE_ALPHA = 1.0
+
+# Chargement paresseux de l'encodeur et de la projection
+_encoder = None
+_projection = None
+
+def get_encoder():
+    global _encoder
+    if _encoder is None:
+        tokenizer = AutoTokenizer.from_pretrained(FAST_MODEL_NAME)
+        model = AutoModel.from_pretrained(FAST_MODEL_NAME)
+        model.eval()
+        _encoder = (tokenizer, model)
+    return _encoder
+
+def is_available(path=PROJECTION_PATH):
+    return os.path.exists(path)
+
+def get_projection(path=PROJECTION_PATH):
+    global _projection
+    if _projection is None:
+        with np.load(path) as data:
+            if str(data["model_name"]) != FAST_MODEL_NAME:
+                raise ValueError(f"{path} was fitted for {data['model_name']}, not {FAST_MODEL_NAME}")
+            _projection = data["weights"]
+    return _projection
+
+# Vecteurs max-poolés de l'encodeur rapide
+def get_student_embeddings(texts, batch_size=BATCH_SIZE):
+    tokenizer, model = get_encoder()
+    vectors = []
+    for start in range(0, len(texts), batch_size):
+        inputs = tokenizer(list(texts[start:start + batch_size]), return_tensors="pt", truncation=True, padding=True)
+        with torch.no_grad():
+            outputs = model(**inputs)
+            vectors.append(max_pooling(outputs.last_hidden_state, inputs["attention_mask"]).numpy())
+    return np.concatenate(vectors) if vectors else np.empty((0, model.config.hidden_size), dtype=np.float32)
+
+# Vecteurs de l'encodeur rapide projetés dans l'espace CamemBERT : utilisables
+# à la place de extract_plongements_camembert.get_embeddings. La projection est
+# linéaire, donc la différence des projections est la projection de la
+# différence apprise lors de l'entraînement.
+def get_embeddings(texts, batch_size=BATCH_SIZE):
+    return get_student_embeddings(texts, batch_size) @ get_projection()
+
+# Régression ridge sans constante : weights minimise ||X W - Y||² + alpha ||W||²
+def fit_projection(student_diffs, teacher_diffs, alpha=RIDGE_ALPHA):
+    x = np.asarray(student_diffs, dtype=np.float64)
+    y = np.asarray(teacher_diffs, dtype=np.float64)
+    gram = x.T @ x + alpha * np.eye(x.shape[1])
+    return np.linalg.solve(gram, x.T @ y).astype(np.float32)
+
+# Apprentissage de la projection sur les différences d'embedding de paires
+# réelles ; un quart des paires est gardé pour mesurer la qualité
+def train(originals, simplifieds, path=PROJECTION_PATH, alpha=RIDGE_ALPHA, seed=0):
+    from extract_plongements_camembert import get_embeddings as get_teacher_embeddings
+
+    student = get_student_embeddings(simplifieds) - get_student_embeddings(originals)
+    teacher = get_teacher_embeddings(simplifieds) - get_teacher_embeddings(originals)
+    order = np.random.default_rng(seed).permutation(len(student))
+    n_test = len(order) // 4
+    test, fit = order[:n_test], order[n_test:]
+
+    weights = fit_projection(student[fit], teacher[fit], alpha)
+    if n_test:
+        residual = ((student[test] @ weights - teacher[test]) ** 2).sum()
+        total = ((teacher[test] - teacher[fit].mean(axis=0)) ** 2).sum()
+        print(f"R² sur {n_test} paires de test : {1 - residual / total:.3f}")
+    weights = fit_projection(student, teacher, alpha)
+    np.savez(path, weights=weights, model_name=FAST_MODEL_NAME)
+    global _projection
+    _projection = None
+    return weights
+
+def main():
+    parser = argparse.ArgumentParser(description="Distillation de l'encodeur rapide vers l'espace CamemBERT.")
+    parser.add_argument("pairs", help="fichier CSV de paires (colonnes original, simplified)")
+    parser.add_argument("--alpha", type=float, default=RIDGE_ALPHA)
+    parser.add_argument("--output", default=PROJECTION_PATH)
+    args = parser.parse_args()
+    pairs = pd.read_csv(args.pairs)
+    train(pairs["original"].astype(str).tolist(), pairs["simplified"].astype(str).tolist(), args.output, args.alpha)
+    print(f"projection -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import os
+
+# Configuration des threads pour l'inférence sur CPU.
+# Les valeurs par défaut peuvent être fixées par variables d'environnement :
+#   CAMEMBERT_INTRA_OP_THREADS : threads utilisés à l'intérieur d'un opérateur
+#   CAMEMBERT_INTER_OP_THREADS : threads exécutant des opérateurs indépendants
+# Lorsque plusieurs processus partagent la machine, chaque processus doit
+# recevoir sa propre part des cœurs (voir pin_worker) pour éviter la
+# surcharge (oversubscription).
+INTRA_OP_ENV = "CAMEMBERT_INTRA_OP_THREADS"
+INTER_OP_ENV = "CAMEMBERT_INTER_OP_THREADS"
+
+def _env_int(name):
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+# Cœurs disponibles pour le processus courant
+def available_cores():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+# Réglage des pools de threads de torch ; les paramètres absents sont lus dans
+# l'environnement, et laissés aux valeurs par défaut de torch sinon. torch
+# n'est importé qu'ici : le reste du module (découpage et attache des cœurs)
+# sert aussi aux workers qui n'en ont pas besoin.
+def configure_threads(intra_op=None, inter_op=None):
+    import torch
+    intra_op = intra_op or _env_int(INTRA_OP_ENV)
+    inter_op = inter_op or _env_int(INTER_OP_ENV)
+    if intra_op:
+        torch.set_num_threads(intra_op)
+    if inter_op and torch.get_num_interop_threads() != inter_op:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError:
+            # torch n'accepte ce réglage qu'avant le premier calcul parallèle
+            pass
+    return torch.get_num_threads(), torch.get_num_interop_threads()
+
+# Découpage des cœurs en n_workers groupes contigus de tailles égales (à un
+# cœur près)
+def partition_cores(n_workers, cores=None):
+    cores = available_cores() if cores is None else list(cores)
+    n_workers = max(1, min(n_workers, len(cores)))
+    size, extra = divmod(len(cores), n_workers)
+    groups, start = [], 0
+    for i in range(n_workers):
+        end = start + size + (i < extra)
+        groups.append(cores[start:end])
+        start = end
+    return groups
+
+# Attache le processus courant à sa part des cœurs et règle torch pour qu'il
+# n'utilise qu'un thread par cœur attribué ; avec torch_threads=False, torch
+# n'est ni réglé ni importé (niveau « readability »)
+def pin_worker(worker_index, n_workers, cores=None, torch_threads=True):
+    # Avec plus de workers que de cœurs, certains workers partagent un cœur
+    groups = partition_cores(n_workers, cores)
+    group = groups[worker_index % len(groups)]
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, group)
+    if torch_threads:
+        configure_threads(intra_op=len(group), inter_op=1)
+    return group
+
+# Initialiseur pour multiprocessing.Pool : chaque worker prend l'indice suivant
+# dans un compteur partagé (multiprocessing.Value) puis s'attache à ses cœurs.
+#   Pool(n, initializer=init_worker, initargs=(Value("i", 0), n))
+def init_worker(counter, n_workers, cores=None, torch_threads=True):
+    with counter.get_lock():
+        worker_index = counter.value
+        counter.value += 1
+    pin_worker(worker_index, n_workers, cores, torch_threads)
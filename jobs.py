@@ -0,0 +1,251 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sqlite3
+import time
+import numpy as np
+import pandas as pd
+
+# File de tâches persistante pour l'évaluation de gros fichiers de paires.
+# Les tâches sont stockées dans une base SQLite locale : un fichier soumis est
+# découpé en blocs de lignes, que des processus workers réservent, évaluent
+# et enregistrent un par un. Un bloc réservé par un worker qui s'est arrêté
+# est repris quand sa réservation expire, si bien qu'un travail interrompu
+# reprend là où il s'était arrêté.
+#
+#   python jobs.py submit paires.csv --output scores.csv
+#   python jobs.py work --workers 4
+#   python jobs.py status
+#   python jobs.py retry 3
+DEFAULT_DB = "jobs.sqlite"
+CHUNK_SIZE = 256
+# Durée (en secondes) après laquelle un bloc réservé est considéré abandonné
+LEASE_SECONDS = 600
+POLL_SECONDS = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    input_path TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    total INTEGER NOT NULL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    job_id INTEGER NOT NULL,
+    chunk INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    stop INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease REAL,
+    PRIMARY KEY (job_id, chunk)
+);
+CREATE TABLE IF NOT EXISTS results (
+    job_id INTEGER NOT NULL,
+    row INTEGER NOT NULL,
+    score REAL,
+    error TEXT,
+    features TEXT NOT NULL,
+    PRIMARY KEY (job_id, row)
+);
+"""
+
+def connect(db=DEFAULT_DB):
+    conn = sqlite3.connect(db, timeout=60, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+# Lecture d'un fichier de paires : colonnes « original » et « simplified », ou à
+# défaut les deux premières colonnes. source est un chemin ou un fichier ouvert
+# ayant un attribut name (fichier chargé dans l'application). Les cellules vides
+# deviennent des textes vides, que score_pairs signale par une erreur.
+def read_pairs(source):
+    if getattr(source, "name", source).lower().endswith(".xlsx"):
+        pairs = pd.read_excel(source)
+    else:
+        pairs = pd.read_csv(source)
+    if not {"original", "simplified"} <= set(pairs.columns):
+        pairs = pairs.rename(columns=dict(zip(pairs.columns[:2], ["original", "simplified"])))
+    return pairs.fillna({"original": "", "simplified": ""}).astype({"original": str, "simplified": str})
+
+# Soumission d'un fichier : création du travail et de ses blocs
+def submit(conn, input_path, output_path=None, chunk_size=CHUNK_SIZE):
+    input_path = os.path.abspath(input_path)
+    output_path = os.path.abspath(output_path or os.path.splitext(input_path)[0] + "_scores.csv")
+    total = len(read_pairs(input_path))
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    job_id = conn.execute(
+        "INSERT INTO jobs (input_path, output_path, total, created, updated) VALUES (?, ?, ?, ?, ?)",
+        (input_path, output_path, total, now, now)).lastrowid
+    conn.executemany(
+        "INSERT INTO tasks (job_id, chunk, start, stop) VALUES (?, ?, ?, ?)",
+        [(job_id, i, start, min(start + chunk_size, total))
+         for i, start in enumerate(range(0, total, chunk_size))])
+    if total == 0:
+        conn.execute("UPDATE jobs SET status = 'done' WHERE id = ?", (job_id,))
+    conn.execute("COMMIT")
+    if total == 0:
+        write_output(conn, job_id)
+    return job_id
+
+# Réservation du prochain bloc libre (ou dont la réservation a expiré)
+def claim(conn, worker):
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    row = conn.execute(
+        """SELECT t.job_id, t.chunk, t.start, t.stop FROM tasks t JOIN jobs j ON j.id = t.job_id
+           WHERE j.status IN ('queued', 'running')
+             AND (t.status = 'pending' OR (t.status = 'running' AND t.lease < ?))
+           ORDER BY t.job_id, t.chunk LIMIT 1""", (now,)).fetchone()
+    if row is not None:
+        conn.execute("UPDATE tasks SET status = 'running', worker = ?, lease = ? WHERE job_id = ? AND chunk = ?",
+                     (worker, now + LEASE_SECONDS, row[0], row[1]))
+        conn.execute("UPDATE jobs SET status = 'running', updated = ? WHERE id = ? AND status = 'queued'",
+                     (now, row[0]))
+    conn.execute("COMMIT")
+    return row
+
+# Enregistrement des résultats d'un bloc ; le dernier bloc terminé écrit le
+# fichier de sortie du travail
+def complete(conn, job_id, chunk, scored):
+    features = scored.drop(columns=["original", "simplified", "score", "error"])
+    # Une paire non évaluable (voir score_pairs) a un score NULL et son erreur
+    rows = [(job_id, int(row), None if pd.notna(error) else float(score), error if pd.notna(error) else None,
+             json.dumps(feats))
+            for row, score, error, feats in
+            zip(scored.index, scored["score"], scored["error"], features.to_dict("records"))]
+    conn.execute("BEGIN IMMEDIATE")
+    conn.executemany("INSERT OR REPLACE INTO results (job_id, row, score, error, features) VALUES (?, ?, ?, ?, ?)",
+                     rows)
+    conn.execute("UPDATE tasks SET status = 'done', lease = NULL WHERE job_id = ? AND chunk = ?", (job_id, chunk))
+    remaining = conn.execute("SELECT COUNT(*) FROM tasks WHERE job_id = ? AND status != 'done'",
+                             (job_id,)).fetchone()[0]
+    finished = remaining == 0 and conn.execute(
+        "UPDATE jobs SET status = 'done', updated = ? WHERE id = ? AND status = 'running'",
+        (time.time(), job_id)).rowcount == 1
+    conn.execute("COMMIT")
+    if finished:
+        write_output(conn, job_id)
+
+def fail(conn, job_id, chunk, error):
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("UPDATE tasks SET status = 'failed', lease = NULL WHERE job_id = ? AND chunk = ?", (job_id, chunk))
+    conn.execute("UPDATE jobs SET status = 'failed', error = ?, updated = ? WHERE id = ?",
+                 (error, time.time(), job_id))
+    conn.execute("COMMIT")
+
+# Fichier de sortie : colonnes d'entrée, score, erreur puis différences de
+# lisibilité
+def write_output(conn, job_id):
+    input_path, output_path = conn.execute(
+        "SELECT input_path, output_path FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    pairs = read_pairs(input_path)
+    rows, scores, errors, features = [], [], [], []
+    for row, score, error, feats in conn.execute(
+            "SELECT row, score, error, features FROM results WHERE job_id = ? ORDER BY row", (job_id,)):
+        rows.append(row)
+        scores.append(np.nan if score is None else score)
+        errors.append(error)
+        features.append(json.loads(feats))
+    results = pd.DataFrame(features, index=rows)
+    results.insert(0, "score", scores)
+    results.insert(1, "error", errors)
+    pairs.drop(columns=results.columns, errors="ignore").join(results).to_csv(output_path, index=False)
+
+# Boucle d'un worker : les modèles ne sont chargés qu'une fois par processus,
+# et chaque fichier d'entrée n'est lu qu'une fois
+def work(db=DEFAULT_DB, forever=False):
+    from prediction_cache import get_cache
+    from scoring import score_pairs
+    conn = connect(db)
+    worker = f"{os.uname().nodename}:{os.getpid()}"
+    inputs = {}
+    while True:
+        task = claim(conn, worker)
+        if task is None:
+            if not forever:
+                break
+            time.sleep(POLL_SECONDS)
+            continue
+        job_id, chunk, start, stop = task
+        try:
+            if job_id not in inputs:
+                input_path = conn.execute("SELECT input_path FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+                inputs[job_id] = read_pairs(input_path)
+            pairs = inputs[job_id].iloc[start:stop]
+            scored = score_pairs(pairs["original"], pairs["simplified"], cache=get_cache()).set_axis(pairs.index)
+            complete(conn, job_id, chunk, scored)
+        except Exception as err:
+            fail(conn, job_id, chunk, repr(err))
+    conn.close()
+
+def _pinned_work(counter, n_workers, db, forever):
+    from inference_config import init_worker
+    init_worker(counter, n_workers)
+    work(db, forever)
+
+# Lancement de n_workers processus, chacun attaché à sa part des cœurs
+def run_workers(n_workers=1, db=DEFAULT_DB, forever=False):
+    if n_workers == 1:
+        return work(db, forever)
+    ctx = mp.get_context("spawn")
+    counter = ctx.Value("i", 0)
+    procs = [ctx.Process(target=_pinned_work, args=(counter, n_workers, db, forever)) for _ in range(n_workers)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+
+# Remise en attente des blocs d'un travail en échec
+def retry(conn, job_id):
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("UPDATE tasks SET status = 'pending', worker = NULL WHERE job_id = ? AND status = 'failed'",
+                 (job_id,))
+    conn.execute("UPDATE jobs SET status = 'running', error = NULL, updated = ? WHERE id = ? AND status = 'failed'",
+                 (time.time(), job_id))
+    conn.execute("COMMIT")
+
+# État des travaux : avancement en nombre de paires évaluées
+def status(conn):
+    return pd.read_sql_query(
+        """SELECT j.id, j.status, j.total,
+                  (SELECT COUNT(*) FROM results r WHERE r.job_id = j.id) AS done,
+                  j.input_path, j.output_path, j.error
+           FROM jobs j ORDER BY j.id""", conn)
+
+def main():
+    parser = argparse.ArgumentParser(description="File de tâches pour l'évaluation de fichiers de paires.")
+    parser.add_argument("--db", default=DEFAULT_DB, help="base SQLite (défaut : %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    submit_parser = commands.add_parser("submit", help="soumettre un fichier CSV/XLSX de paires")
+    submit_parser.add_argument("input")
+    submit_parser.add_argument("--output", help="fichier CSV de sortie (défaut : <entrée>_scores.csv)")
+    submit_parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    work_parser = commands.add_parser("work", help="évaluer les blocs en attente")
+    work_parser.add_argument("--workers", type=int, default=1)
+    work_parser.add_argument("--forever", action="store_true", help="attendre de nouveaux travaux")
+    retry_parser = commands.add_parser("retry", help="reprendre un travail en échec")
+    retry_parser.add_argument("job", type=int)
+    commands.add_parser("status", help="afficher l'avancement des travaux")
+    args = parser.parse_args()
+
+    if args.command == "submit":
+        job_id = submit(connect(args.db), args.input, args.output, args.chunk_size)
+        print(f"travail {job_id} soumis")
+    elif args.command == "work":
+        run_workers(args.workers, args.db, args.forever)
+    elif args.command == "retry":
+        retry(connect(args.db), args.job)
+    else:
+        with pd.option_context("display.width", 200, "display.max_colwidth", 60):
+            print(status(connect(args.db)).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import argparse
+import hashlib
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Format d'export des modèles du niveau principal, chargé sans pickle.
+# Les paramètres de la PCA et du MLP sont écrits dans un fichier .npz plat
+# (tableaux NumPy, aucun objet Python) ; le chargeur reconstruit des objets
+# d'inférence légers qui reproduisent les calculs de scikit-learn, dans le
+# même ordre d'opérations. Le chargement n'importe ni scikit-learn ni joblib
+# et ne peut pas exécuter de code.
+# Le fichier garde l'empreinte SHA-256 des deux .pkl dont il est issu :
+# scoring ne l'utilise que s'il correspond encore aux .pkl présents, et
+# revient aux pickles sinon.
+#
+#   python model_artifacts.py            (écrit model_artifacts.npz)
+#   python model_artifacts.py --check    (compare aux pickles, mesure le chargement)
+ARTIFACTS_PATH = "model_artifacts.npz"
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _as_array(X):
+    X = X.to_numpy() if isinstance(X, pd.DataFrame) else np.asarray(X)
+    return X if X.dtype in (np.float32, np.float64) else X.astype(np.float64)
+
+# Équivalent de sklearn.decomposition.PCA pour transform
+class LinearPCA:
+    def __init__(self, mean, components, explained_variance, whiten, feature_names):
+        self.mean_ = mean
+        self.components_ = components
+        self.explained_variance_ = explained_variance
+        self.whiten = whiten
+        self.n_components_ = components.shape[0]
+        self.feature_names_in_ = feature_names
+
+    def transform(self, X):
+        if isinstance(X, pd.DataFrame):
+            X = X[self.feature_names_in_]
+        X = _as_array(X)
+        # Centrage après projection, comme scikit-learn
+        projected = X @ self.components_.T
+        projected -= self.mean_.reshape(1, -1) @ self.components_.T
+        if self.whiten:
+            scale = np.sqrt(self.explained_variance_)
+            scale[scale < np.finfo(scale.dtype).eps] = np.finfo(scale.dtype).eps
+            projected /= scale
+        return projected
+
+def _tanh(x):
+    return np.tanh(x, out=x)
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+def _logistic(x):
+    x *= -1
+    np.exp(x, out=x)
+    x += 1
+    return np.reciprocal(x, out=x)
+
+ACTIVATIONS = {"identity": lambda x: x, "tanh": _tanh, "relu": _relu, "logistic": _logistic}
+
+# Équivalent de sklearn.neural_network.MLPRegressor pour predict
+class MLP:
+    def __init__(self, coefs, intercepts, activation, out_activation, feature_names):
+        self.coefs_ = coefs
+        self.intercepts_ = intercepts
+        self.activation = activation
+        self.out_activation_ = out_activation
+        self.n_layers_ = len(coefs) + 1
+        self.feature_names_in_ = feature_names
+
+    def predict(self, X):
+        if isinstance(X, pd.DataFrame):
+            X = X[self.feature_names_in_]
+        activation = _as_array(X)
+        for i, (coef, intercept) in enumerate(zip(self.coefs_, self.intercepts_)):
+            activation = activation @ coef
+            activation += intercept
+            if i != len(self.coefs_) - 1:
+                ACTIVATIONS[self.activation](activation)
+        ACTIVATIONS[self.out_activation_](activation)
+        return activation.ravel() if activation.shape[1] == 1 else activation
+
+# Export des objets scikit-learn (par défaut ceux de scoring.MODEL_PATH et
+# scoring.PCA_PATH)
+def export(model_path, pca_path, path=ARTIFACTS_PATH):
+    import joblib
+    model, pca = joblib.load(model_path), joblib.load(pca_path)
+    arrays = {
+        "source_digest": np.array(source_digest(model_path, pca_path)),
+        "pca_mean": pca.mean_,
+        "pca_components": pca.components_,
+        "pca_explained_variance": pca.explained_variance_,
+        "pca_whiten": np.array(bool(pca.whiten)),
+        "pca_feature_names": np.array(pca.feature_names_in_, dtype=str),
+        "mlp_activation": np.array(model.activation),
+        "mlp_out_activation": np.array(model.out_activation_),
+        "mlp_feature_names": np.array(model.feature_names_in_, dtype=str),
+        "mlp_layers": np.array(len(model.coefs_)),
+    }
+    for i, (coef, intercept) in enumerate(zip(model.coefs_, model.intercepts_)):
+        arrays[f"mlp_coef_{i}"] = coef
+        arrays[f"mlp_intercept_{i}"] = intercept
+    np.savez(path, **arrays)
+    return path
+
+def source_digest(model_path, pca_path):
+    return file_digest(model_path) + file_digest(pca_path)
+
+# Chargement : renvoie (model, pca). Avec model_path et pca_path, le fichier
+# n'est accepté que s'il a été exporté depuis ces .pkl (ValueError sinon).
+def load(path=ARTIFACTS_PATH, model_path=None, pca_path=None):
+    with np.load(path, allow_pickle=False) as data:
+        if model_path and pca_path and str(data["source_digest"]) != source_digest(model_path, pca_path):
+            raise ValueError(f"{path} was exported from other model files; run: python model_artifacts.py")
+        pca = LinearPCA(data["pca_mean"], data["pca_components"], data["pca_explained_variance"],
+                        bool(data["pca_whiten"]), list(data["pca_feature_names"]))
+        layers = int(data["mlp_layers"])
+        model = MLP([data[f"mlp_coef_{i}"] for i in range(layers)],
+                    [data[f"mlp_intercept_{i}"] for i in range(layers)],
+                    str(data["mlp_activation"]), str(data["mlp_out_activation"]),
+                    list(data["mlp_feature_names"]))
+    return model, pca
+
+# Temps de chargement dans un processus neuf, imports de numpy et pandas
+# exclus (scoring les importe de toute façon) ; le chargement .npz vérifie
+# l'empreinte des .pkl comme au démarrage de scoring
+def _timed_load(fmt, model_path, pca_path, path):
+    import subprocess
+    load = (f"import model_artifacts; model_artifacts.load({path!r}, {model_path!r}, {pca_path!r})" if fmt == "npz"
+            else f"import joblib; joblib.load({model_path!r}); joblib.load({pca_path!r})")
+    code = f"import time, numpy, pandas; start = time.perf_counter(); {load}; print(time.perf_counter() - start)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)))
+    return float(out.stdout.split()[-1])
+
+# Comparaison aux pickles sur des entrées aléatoires à l'échelle des données
+def check(model_path, pca_path, path=ARTIFACTS_PATH, n=1000, repeat=5):
+    import joblib
+    ref_model, ref_pca = joblib.load(model_path), joblib.load(pca_path)
+    model, pca = load(path, model_path, pca_path)
+    rng = np.random.default_rng(0)
+    emb = pd.DataFrame(rng.standard_normal((n, len(pca.feature_names_in_))) * 0.1, columns=pca.feature_names_in_)
+    read = pd.DataFrame(rng.standard_normal((n, len(model.feature_names_in_) - pca.n_components_)) * 5,
+                        columns=model.feature_names_in_[pca.n_components_:])
+    for dtype in (np.float64, np.float32):
+        projected, ref_projected = pca.transform(emb.astype(dtype)), ref_pca.transform(emb.astype(dtype))
+        features = pd.concat([pd.DataFrame(ref_projected, columns=model.feature_names_in_[:pca.n_components_]), read], axis=1)
+        print(f"{np.dtype(dtype).name}: PCA identique {np.array_equal(projected, ref_projected)}, "
+              f"MLP identique {np.array_equal(model.predict(features), ref_model.predict(features))}")
+    for fmt in ("pickle", "npz"):
+        timings = [_timed_load(fmt, model_path, pca_path, path) for _ in range(repeat)]
+        print(f"chargement {fmt:>6} : {np.median(timings) * 1000:.0f} ms (médiane de {repeat})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Export des modèles au format .npz.")
+    parser.add_argument("--model", default="mlp_exp_max_rev_read_model.pkl")
+    parser.add_argument("--pca", default="pca_model_max_rev.pkl")
+    parser.add_argument("--output", default=ARTIFACTS_PATH)
+    parser.add_argument("--check", action="store_true", help="comparer aux pickles et mesurer le chargement")
+    args = parser.parse_args()
+
+    if args.check:
+        check(args.model, args.pca, args.output)
+    else:
+        export(args.model, args.pca, args.output)
+        print(f"{args.output} écrit", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import gc
+import multiprocessing as mp
+import sys
+import pandas as pd
+
+# Évaluation parallèle d'un grand nombre de paires sur une machine multi-cœurs.
+# Les paires sont découpées en blocs répartis entre des processus workers, et
+# les résultats sont rassemblés dans l'ordre d'origine.
+#
+# Les modèles (CamemBERT, spaCy fr_core_news_sm, PCA, MLP) sont chargés une
+# seule fois dans le processus parent, avant la création des workers. Sous
+# Linux, les workers sont créés par fork : ils partagent les pages mémoire des
+# poids en copie sur écriture, sans les dupliquer N fois. gc.freeze() évite
+# que le ramasse-miettes ne touche ces objets et ne force leur copie. Sur les
+# systèmes sans fork, chaque worker recharge les modèles.
+#
+#   python parallel_scoring.py paires.csv scores.csv --workers 4
+SHARD_SIZE = 256
+
+# Niveau de score utilisé par les workers (fixé par l'initialiseur)
+_tier = None
+
+# Chargement des modèles du niveau choisi pour des blocs de shard_size paires
+def load_models(tier=None, shard_size=SHARD_SIZE):
+    import scoring
+    from extract_readability import get_nlp
+    get_nlp()
+    tier = scoring.choose_tier(shard_size, tier)
+    if tier == "accurate":
+        import extract_plongements_camembert  # noqa: F401
+    elif tier == "fast":
+        import fast_tier
+        fast_tier.get_encoder()
+        fast_tier.get_projection()
+    elif tier == "readability":
+        import readability_only
+        readability_only.load_model()
+    return tier
+
+def _init(counter, n_workers, tier, shard_size):
+    global _tier
+    from inference_config import init_worker
+    # Le niveau « readability » n'importe pas torch : ses threads ne sont pas réglés
+    init_worker(counter, n_workers, torch_threads=tier != "readability")
+    _tier = load_models(tier, shard_size)
+
+def _score_shard(shard):
+    from prediction_cache import get_cache
+    from scoring import score_pairs
+    originals, simplifieds = shard
+    return score_pairs(originals, simplifieds, tier=_tier, cache=get_cache())
+
+def score_pairs_parallel(originals, simplifieds, n_workers=None, shard_size=SHARD_SIZE, tier=None):
+    originals, simplifieds = list(originals), list(simplifieds)
+    shards = [(originals[start:start + shard_size], simplifieds[start:start + shard_size])
+              for start in range(0, len(originals), shard_size)]
+    n_workers = n_workers or mp.cpu_count()
+    # Le niveau est choisi une fois, d'après la taille réelle des blocs
+    shard_size = min(shard_size, len(originals))
+    from scoring import choose_tier
+    tier = choose_tier(shard_size, tier)
+
+    fork = "fork" in mp.get_all_start_methods()
+    if fork:
+        ctx = mp.get_context("fork")
+        # Chargement avant le fork : les workers héritent des modèles
+        tier = load_models(tier, shard_size)
+        gc.collect()
+        gc.freeze()
+    else:
+        ctx = mp.get_context("spawn")
+    try:
+        counter = ctx.Value("i", 0)
+        with ctx.Pool(n_workers, initializer=_init, initargs=(counter, n_workers, tier, shard_size)) as pool:
+            # imap conserve l'ordre des blocs
+            results = list(pool.imap(_score_shard, shards))
+    finally:
+        if fork:
+            gc.unfreeze()
+    if not results:
+        from extract_readability import DIFF_COLUMNS
+        return pd.DataFrame(columns=["original", "simplified", "score", "error"] + DIFF_COLUMNS)
+    return pd.concat(results, ignore_index=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Évaluation parallèle d'un fichier de paires.")
+    parser.add_argument("input", help="fichier CSV/XLSX de paires (colonnes original, simplified)")
+    parser.add_argument("output", help="fichier CSV de sortie")
+    parser.add_argument("--workers", type=int, default=mp.cpu_count())
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    parser.add_argument("--tier", choices=["accurate", "fast", "readability", "auto"])
+    args = parser.parse_args()
+
+    from jobs import read_pairs
+    pairs = read_pairs(args.input)
+    scored = score_pairs_parallel(pairs["original"], pairs["simplified"], args.workers, args.shard_size, args.tier)
+    pairs.drop(columns=scored.columns, errors="ignore").join(scored).to_csv(args.output, index=False)
+    print(f"{len(scored)} paires -> {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import argparse
+import multiprocessing as mp
+import sys
+import numpy as np
+import pandas as pd
+from shm_transport import SharedRing
+
+# Évaluation en pipeline : l'étape NLP (spaCy + lisibilité) et l'étape encodeur
+# (CamemBERT) tournent chacune dans leur propre processus et ne chargent que
+# leurs modèles. Leurs sorties, des matrices de différences (N, 28) et
+# (N, 768), sont transmises au processus principal par des anneaux de mémoire
+# partagée (shm_transport) ; le processus principal assemble les
+# caractéristiques et applique la PCA et le MLP.
+#
+#   python pipelined_scoring.py paires.csv scores.csv
+CHUNK_SIZE = 64
+# Cases par anneau : nombre de blocs d'avance qu'une étape peut prendre
+N_SLOTS = 4
+
+# Étapes : (originales, simplifiées) -> matrice de différences, une ligne par
+# paire. Les paires identiques valent 0 sans être analysées ; une paire dont un
+# texte est vide ou ne contient aucun mot a une ligne de NaN.
+def readability_stage(originals, simplifieds):
+    from extract_readability import diff_pair_matrix
+    return diff_pair_matrix(originals, simplifieds)
+
+def embedding_stage(originals, simplifieds):
+    from extract_plongements_camembert import get_embeddings
+    texts = list(dict.fromkeys(originals + simplifieds))
+    rows = {text: i for i, text in enumerate(texts)}
+    vectors = get_embeddings(texts)
+    return vectors[[rows[text] for text in simplifieds]] - vectors[[rows[text] for text in originals]]
+
+# Boucle d'une étape : lit les blocs de paires de sa file d'entrée et écrit
+# chaque résultat dans son anneau, avec l'indice du bloc
+def run_stage(stage, inbox, ring):
+    while True:
+        item = inbox.get()
+        if item is None:
+            break
+        index, originals, simplifieds = item
+        ring.put(stage(originals, simplifieds), meta=index)
+    ring.close_stream()
+
+def score_pairs_pipelined(originals, simplifieds, chunk_size=CHUNK_SIZE):
+    from extract_readability import DIFF_COLUMNS, pair_errors
+    from scoring import build_features, model, pca
+
+    originals, simplifieds = list(originals), list(simplifieds)
+    ctx = mp.get_context("spawn")
+    dim = pca.components_.shape[1]
+    stages = [(readability_stage, (chunk_size, len(DIFF_COLUMNS)), np.float64),
+              (embedding_stage, (chunk_size, dim), np.float32)]
+    rings, inboxes, procs = [], [], []
+    for stage, shape, dtype in stages:
+        ring = SharedRing(N_SLOTS, shape, dtype, ctx)
+        inbox = ctx.Queue()
+        proc = ctx.Process(target=run_stage, args=(stage, inbox, ring), name=stage.__name__, daemon=True)
+        proc.start()
+        rings.append(ring)
+        inboxes.append(inbox)
+        procs.append(proc)
+
+    try:
+        # Les textes des blocs sont petits : ils passent par les files
+        chunks = range(0, len(originals), chunk_size)
+        for index, start in enumerate(chunks):
+            for inbox in inboxes:
+                inbox.put((index, originals[start:start + chunk_size], simplifieds[start:start + chunk_size]))
+        for inbox in inboxes:
+            inbox.put(None)
+
+        read_ring, emb_ring = rings
+        scores, errors = [], []
+        for index, start in enumerate(chunks):
+            chunk_originals = originals[start:start + chunk_size]
+            chunk_simplifieds = simplifieds[start:start + chunk_size]
+            read_slot, read_rows, read_index = read_ring.get(procs)
+            emb_slot, emb_rows, emb_index = emb_ring.get(procs)
+            assert read_index == emb_index == index
+            errors += pair_errors(chunk_originals, chunk_simplifieds, read_rows)
+            # Une paire non évaluable (ligne de NaN) garde un score NaN
+            valid = ~np.isnan(read_rows).any(axis=1)
+            read_df = pd.DataFrame(read_rows[valid], columns=DIFF_COLUMNS)
+            emb_df = pd.DataFrame(emb_rows[valid], columns=[f"max_{i}" for i in range(dim)])
+            # build_features copie les données : les cases peuvent être libérées
+            features = build_features(emb_df, read_df)
+            read_ring.release(read_slot)
+            emb_ring.release(emb_slot)
+            chunk_scores = np.full(len(valid), np.nan)
+            if valid.any():
+                chunk_scores[valid] = model.predict(features)
+            # Une paire identique n'apporte aucune amélioration
+            same = [o.strip() == s.strip() for o, s in zip(chunk_originals, chunk_simplifieds)]
+            chunk_scores[np.array(same, dtype=bool) & valid] = 0.0
+            scores.append(chunk_scores)
+        for proc in procs:
+            proc.join()
+    finally:
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+        for ring in rings:
+            ring.close()
+
+    return pd.DataFrame({"original": originals, "simplified": simplifieds,
+                         "score": np.concatenate(scores) if scores else np.empty(0), "error": errors})
+
+def main():
+    parser = argparse.ArgumentParser(description="Évaluation en pipeline d'un fichier de paires.")
+    parser.add_argument("input", help="fichier CSV/XLSX de paires (colonnes original, simplified)")
+    parser.add_argument("output", help="fichier CSV de sortie")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    from jobs import read_pairs
+    pairs = read_pairs(args.input)
+    scored = score_pairs_pipelined(pairs["original"], pairs["simplified"], args.chunk_size)
+    pairs.drop(columns=scored.columns, errors="ignore").join(scored).to_csv(args.output, index=False)
+    print(f"{len(scored)} paires -> {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
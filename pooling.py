@@ -0,0 +1,34 @@
+import torch
+
+# Fonctions de pooling des embeddings de tokens en un vecteur par phrase.
+# Elles acceptent des lots complétés (padding) : token_embeddings (B, T, H) et
+# attention_mask (B, T). Le masque n'est jamais étendu à la taille (B, T, H) et
+# les sorties du modèle ne sont pas modifiées sur place.
+
+# Max pooling : les positions de padding sont remplacées par la plus petite
+# valeur représentable avant de prendre le maximum
+def max_pooling(token_embeddings, attention_mask):
+    padding = (attention_mask == 0).unsqueeze(-1)
+    fill = torch.finfo(token_embeddings.dtype).min
+    return token_embeddings.masked_fill(padding, fill).max(dim=1)[0]
+
+# Mean pooling : somme pondérée par le masque calculée par un produit matriciel
+# (B, 1, T) x (B, T, H), puis division par le nombre de tokens réels
+def mean_pooling(token_embeddings, attention_mask):
+    mask = attention_mask.to(token_embeddings.dtype).unsqueeze(1)
+    summed = torch.bmm(mask, token_embeddings).squeeze(1)
+    counts = mask.sum(dim=2).clamp(min=1)
+    return summed / counts
+
+# CLS pooling : vecteur du premier token (<s>)
+def cls_pooling(token_embeddings, attention_mask):
+    return token_embeddings[:, 0]
+
+POOLINGS = {
+    "max": max_pooling,
+    "mean": mean_pooling,
+    "cls": cls_pooling,
+}
+
+def pool(token_embeddings, attention_mask, strategy="max"):
+    return POOLINGS[strategy](token_embeddings, attention_mask)
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from model_artifacts import file_digest
+
+# Cache persistant des prédictions complètes (score et différences de
+# lisibilité) d'une paire, partagé entre les sessions de l'application et les
+# traitements par lot. Les entrées sont stockées dans une base SQLite locale,
+# sous une clé qui hache le texte des deux phrases, le niveau de score, la
+# précision des caractéristiques et la version des fichiers de modèle du
+# niveau (empreinte SHA-256 de leur contenu). Quand un de ces fichiers change,
+# les clés changent et les entrées de l'ancienne version sont supprimées à la
+# première utilisation du niveau.
+#
+# Le chemin de la base est lu dans PREDICTION_CACHE (predictions.sqlite par
+# défaut) ; une valeur vide désactive le cache.
+CACHE_PATH_ENV = "PREDICTION_CACHE"
+DEFAULT_PATH = "predictions.sqlite"
+# Nombre maximal de clés par requête SELECT ... IN
+QUERY_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    key TEXT PRIMARY KEY,
+    tier TEXT NOT NULL,
+    version TEXT NOT NULL,
+    score REAL NOT NULL,
+    features TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS predictions_version ON predictions (tier, version);
+"""
+
+# Fichiers (et noms de modèles) dont dépendent les scores d'un niveau
+def tier_artifacts(tier):
+    if tier == "readability":
+        import readability_only
+        return [readability_only.MODEL_PATH]
+    import scoring
+    artifacts = [scoring.MODEL_PATH, scoring.PCA_PATH]
+    if tier == "fast":
+        import fast_tier
+        artifacts += [fast_tier.PROJECTION_PATH, fast_tier.FAST_MODEL_NAME]
+    return artifacts
+
+class PredictionCache:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.pid = os.getpid()
+        # Une connexion partagée entre les threads des sessions Streamlit
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._versions = {}
+
+    # Version des modèles d'un niveau, calculée une fois par processus (les
+    # modèles sont chargés une fois au démarrage)
+    def version(self, tier):
+        if tier not in self._versions:
+            digest = hashlib.sha256()
+            for artifact in tier_artifacts(tier):
+                digest.update((file_digest(artifact) if os.path.exists(artifact) else artifact).encode())
+            version = digest.hexdigest()
+            with self._lock:
+                self._conn.execute("DELETE FROM predictions WHERE tier = ? AND version != ?", (tier, version))
+            self._versions[tier] = version
+        return self._versions[tier]
+
+    def key(self, original, simplified, tier, dtype):
+        payload = json.dumps([self.version(tier), tier, dtype, original, simplified], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # Entrées présentes parmi keys : clé -> (score, {diff_*: valeur})
+    def get_many(self, keys):
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), QUERY_CHUNK):
+                chunk = keys[start:start + QUERY_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT key, score, features FROM predictions WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk)
+                found.update((key, (score, json.loads(features))) for key, score, features in rows)
+        return found
+
+    # entries : (clé, niveau, score, {diff_*: valeur})
+    def put_many(self, entries):
+        now = time.time()
+        rows = [(key, tier, self.version(tier), float(score), json.dumps(features), now)
+                for key, tier, score, features in entries]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM predictions")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+# Cache partagé du processus, ou None si PREDICTION_CACHE est vide
+_shared = None
+
+def get_cache():
+    global _shared
+    path = os.environ.get(CACHE_PATH_ENV, DEFAULT_PATH)
+    if not path:
+        return None
+    # Une connexion SQLite ne doit pas traverser un fork : chaque processus
+    # ouvre la sienne
+    if _shared is None or _shared.path != path or _shared.pid != os.getpid():
+        _shared = PredictionCache(path)
+    return _shared
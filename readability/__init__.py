@@ -1,7 +1,8 @@
 """Simple readability measures.
 
 Usage: %(cmd)s [--lang=<x>] [FILE]
-or: %(cmd)s [--lang=<x>] --csv FILES...
+or: %(cmd)s [--lang=<x>] (--csv | --jsonl | --parquet=<out>) FILES...
+or: %(cmd)s [--lang=<x>] (--csv | --jsonl | --parquet=<out>) --files-from=<list>
 
 By default, input is read from standard input.
 Text should be encoded with UTF-8,
@@ -10,7 +11,17 @@ one sentence per line, tokens space-separated.
 Options:
   -L, --lang=<x>   Set language (available: %(lang)s).
   --csv            Produce a table in comma separated value format on
-                   standard output given one or more filenames.
+                   standard output given one or more filenames. Each row is
+                   written as soon as its file has been processed.
+  --jsonl          Like --csv, but write one JSON object per file (JSON Lines),
+                   with the filename under "file".
+  --parquet=<out>  Like --csv, but write the table to the Parquet file <out>,
+                   one row group per --chunk-size files (requires pyarrow).
+  --chunk-size=<n>
+                   Number of files per Parquet row group (default: 1000).
+  --files-from=<list>
+                   Read the filenames, one per line, from the file <list>
+                   (- for standard input) instead of the command line.
   --tokenizer=<x>  Specify a tokenizer including options that will be given
                    each text on stdin and should return tokenized output on
                    stdout. Not applicable when reading from stdin."""
@@ -18,6 +29,8 @@ Options:
 from __future__ import division, print_function, unicode_literals
 import io
 import os
+import csv
+import json
 try:
 	import re2 as re
 except ImportError:
@@ -28,6 +41,11 @@ import string
 import getopt
 import subprocess
 import collections
+from array import array
+try:
+	from collections.abc import Mapping
+except ImportError:
+	from collections import Mapping
 from readability.langdata import LANGDATA
 if sys.version[0] >= '3':
 	unicode = str  # pylint: disable=invalid-name,redefined-builtin
@@ -68,7 +86,122 @@ DIRECTSPEECHRE = re.compile(
 # U+00BB right-pointing double angle quotation mark
 
 
-def getmeasures(text, lang='en', merge=False):
+READABILITY_GRADES = ('Kincaid', 'ARI', 'Coleman-Liau', 'FleschReadingEase',
+		'GunningFogIndex', 'LIX', 'SMOGIndex', 'RIX', 'REL', 'KandelMoles')
+SENTENCE_INFO = ('characters_per_word', 'syll_per_word', 'words_per_sentence',
+		'sentences_per_paragraph', 'type_token_ratio', 'directspeech_ratio',
+		'characters', 'syllables', 'words', 'wordtypes', 'sentences',
+		'paragraphs', 'long_words', 'complex_words')
+# Counts, reported as integers by the dictionary views.
+COUNTS = frozenset(('characters', 'syllables', 'words', 'wordtypes',
+		'sentences', 'paragraphs', 'long_words', 'complex_words',
+		'complex_words_dc', 'complex_words_mes'))
+
+
+class Schema(object):
+	"""Names and layout of the measures reported for one language.
+
+	``slots`` gives the ``(category, name)`` of each stored value, in order.
+	A name can appear in two categories (e.g. ``pronoun`` in word usage and in
+	sentence beginnings); ``names`` lists each name once, in the order of the
+	merged dictionary, and ``index`` maps it to the slot that the merged
+	dictionary reports, i.e. the last one, as later categories overwrite
+	earlier ones.
+
+	Use :func:`getschema` to get the (shared) schema of a language."""
+	__slots__ = ('lang', 'categories', 'slots', 'names', 'index', 'counts')
+
+	def __init__(self, lang):
+		grades = READABILITY_GRADES
+		info = SENTENCE_INFO
+		if LANGDATA[lang].get('basicwords'):
+			grades += ('DaleChallIndex', 'Mesnager')
+			info += ('complex_words_dc', 'complex_words_mes')
+		wordusage = tuple(LANGDATA[lang]['words'])
+		beginnings = tuple(LANGDATA[lang]['beginnings'])
+		self.lang = lang
+		self.slots = tuple((category, name) for category, names in (
+				('readability grades', grades),
+				('sentence info', info),
+				('word usage', wordusage),
+				('sentence beginnings', beginnings))
+				for name in names)
+		self.categories = collections.OrderedDict()
+		for n, (category, name) in enumerate(self.slots):
+			self.categories.setdefault(category, []).append((name, n))
+		self.index = {}
+		for n, (_, name) in enumerate(self.slots):
+			self.index[name] = n
+		self.names = tuple(collections.OrderedDict.fromkeys(
+				name for _, name in self.slots))
+		self.counts = COUNTS.union(wordusage, beginnings)
+
+
+_SCHEMAS = {}
+
+
+def getschema(lang='en'):
+	"""Return the :class:`Schema` of the measures for a language."""
+	if lang not in _SCHEMAS:
+		_SCHEMAS[lang] = Schema(lang)
+	return _SCHEMAS[lang]
+
+
+class Measures(Mapping):
+	"""Fixed-schema record of the measures of one text.
+
+	The values are stored in a flat array of doubles, ``array``, in the order
+	of ``schema.slots``; records of the same language can be stacked into a
+	matrix without building dictionaries, e.g. with
+	``numpy.frombuffer(record.array)``.
+
+	The record is also a read-only mapping from measure name to value, with
+	the same keys and values as the dictionary returned with ``merge=True``;
+	counts are returned as integers.
+
+	>>> record = getmeasures("A tokenized sentence .", record=True)
+	>>> record['words'], len(record.array) == len(record.schema.slots)
+	(3, True)
+	>>> len(record) == len(dict(record)) == len(record.merged())
+	True
+	"""
+	__slots__ = ('schema', 'array')
+
+	def __init__(self, schema, array):
+		self.schema = schema
+		self.array = array
+
+	def _value(self, name, n):
+		value = self.array[n]
+		return int(value) if name in self.schema.counts else value
+
+	def __getitem__(self, name):
+		return self._value(name, self.schema.index[name])
+
+	def __iter__(self):
+		return iter(self.schema.names)
+
+	def __len__(self):
+		return len(self.schema.names)
+
+	def __repr__(self):
+		return 'Measures(%r, %r)' % (self.schema.lang, dict(self))
+
+	def merged(self):
+		"""Return the measures as a single ordered dictionary."""
+		return collections.OrderedDict(
+				(name, self[name]) for name in self.schema.names)
+
+	def nested(self):
+		"""Return the measures as a two-level ordered dictionary by
+		category."""
+		return collections.OrderedDict(
+				(category, collections.OrderedDict(
+					(name, self._value(name, n)) for name, n in slots))
+				for category, slots in self.schema.categories.items())
+
+
+def getmeasures(text, lang='en', merge=False, record=False):
 	"""Collect surface characteristics of a tokenized text.
 
 	>>> text = "A tokenized sentence .\\nAnother sentence ."
@@ -82,6 +215,8 @@ def getmeasures(text, lang='en', merge=False):
 		word types to count.
 	:param merge: if ``True``, return a dictionary results into a single
 		dictionary of key-value pairs.
+	:param record: if ``True``, return a :class:`Measures` record instead of
+		dictionaries.
 	:returns: a two-level ordered dictionary with measurements."""
 	characters = 0
 	words = 0
@@ -93,16 +228,15 @@ def getmeasures(text, lang='en', merge=False):
 	paragraphs = 0
 	sentences = 0
 	directspeech = 0
-	vocabulary = set()
+	tokens = []
 	syllcounter = LANGDATA[lang]['syllables']
+	syllbatchcounter = LANGDATA[lang].get('syllables_batch')
 	wordusageregexps = LANGDATA[lang]['words']
 	beginningsregexps = LANGDATA[lang]['beginnings']
 	basicwords = LANGDATA[lang].get('basicwords', frozenset())
 
-	wordusage = collections.OrderedDict([(name, 0) for name, regexp
-			in wordusageregexps.items()])
-	beginnings = collections.OrderedDict([(name, 0) for name, regexp
-			in beginningsregexps.items()])
+	wordusage = [0] * len(wordusageregexps)
+	beginnings = [0] * len(beginningsregexps)
 
 	if isinstance(text, bytes):
 		raise ValueError('Expected: unicode string or an iterable of lines')
@@ -115,29 +249,13 @@ def getmeasures(text, lang='en', merge=False):
 			directspeech += DIRECTSPEECHRE.search(sent) is not None
 		# paragraphs = text.count('\n\n')
 		# sentences = text.count('\n') - paragraphs
-		for token in text.split():
-			if PUNCTRE.match(token) is not None:
-				continue
-			vocabulary.add(token)
-			words += 1
-			characters += len(token)
-			syll = syllcounter(token)
-			syllables += syll
-			if len(token) >= 7:
-				long_words += 1
-
-			# ignore proper nouns and numbers
-			if not token[0].isupper() and not token.isdigit():
-				if syll >= 3:
-					complex_words += 1
-				if token.lower() not in basicwords:
-					complex_words_dc += 1
-					complex_words_mes += 1  # Mesnager : Mark word as complex if not in French basicwords list (string input).
-
-		for name, regexp in wordusageregexps.items():
-			wordusage[name] += sum(1 for _ in regexp.finditer(text))
-		for name, regexp in beginningsregexps.items():
-			beginnings[name] += sum(1 for _ in regexp.finditer(text))
+		tokens.extend(token for token in text.split()
+				if PUNCTRE.match(token) is None)
+
+		for n, regexp in enumerate(wordusageregexps.values()):
+			wordusage[n] += sum(1 for _ in regexp.finditer(text))
+		for n, regexp in enumerate(beginningsregexps.values()):
+			beginnings[n] += sum(1 for _ in regexp.finditer(text))
 	else:  # Collect surface characteristics from an iterable.
 		prevempty = True
 		for sent in text:
@@ -152,85 +270,81 @@ def getmeasures(text, lang='en', merge=False):
 
 			sentences += 1
 			directspeech += DIRECTSPEECHRE.search(sent) is not None
-			for token in sent.split():
-				if PUNCTRE.match(token) is not None:
-					continue
-				vocabulary.add(token)
-				words += 1
-				characters += len(token)
-				syll = syllcounter(token)
-				syllables += syll
-				if len(token) >= 7:
-					long_words += 1
-
-				# ignore proper nouns and numbers
-				if not token[0].isupper() and not token.isdigit():
-					if syll >= 3:
-						complex_words += 1
-					if token.lower() not in basicwords:
-						complex_words_dc += 1
-						complex_words_mes += 1  # Mesnager: Mark word as complex if not in French basicwords list (iterable input).
-
-			for name, regexp in wordusageregexps.items():
-				wordusage[name] += sum(1 for _ in regexp.finditer(sent))
-			for name, regexp in beginningsregexps.items():
-				beginnings[name] += regexp.match(sent) is not None
+			tokens.extend(token for token in sent.split()
+					if PUNCTRE.match(token) is None)
+			for n, regexp in enumerate(wordusageregexps.values()):
+				wordusage[n] += sum(1 for _ in regexp.finditer(sent))
+			for n, regexp in enumerate(beginningsregexps.values()):
+				beginnings[n] += regexp.match(sent) is not None
+
+	# Word attributes are computed once per word type and weighted by the
+	# number of occurrences; syllables are counted for the whole vocabulary.
+	vocabulary = collections.Counter(tokens)
+	if syllbatchcounter is not None:
+		syllcounts = syllbatchcounter(vocabulary)
+	else:
+		syllcounts = {token: syllcounter(token) for token in vocabulary}
+	for token, count in vocabulary.items():
+		words += count
+		characters += len(token) * count
+		syll = syllcounts[token]
+		syllables += syll * count
+		if len(token) >= 7:
+			long_words += count
+
+		# ignore proper nouns and numbers
+		if not token[0].isupper() and not token.isdigit():
+			if syll >= 3:
+				complex_words += count
+			if token.lower() not in basicwords:
+				complex_words_dc += count
+				complex_words_mes += count  # Mesnager : Mark word as complex if not in French basicwords list.
 
 	if not words:
 		raise ValueError("I can't do this, there's no words there!")
 
-	stats = collections.OrderedDict([
-			('characters_per_word', characters / words),
-			('syll_per_word', syllables / words),
-			('words_per_sentence', words / sentences),
-			('sentences_per_paragraph', sentences / paragraphs),
-			('type_token_ratio', len(vocabulary) / words),
-			('directspeech_ratio', directspeech / sentences),
-			('characters', characters),
-			('syllables', syllables),
-			('words', words),
-			('wordtypes', len(vocabulary)),
-			('sentences', sentences),
-			('paragraphs', paragraphs),
-			('long_words', long_words),
-			('complex_words', complex_words),
-		])
-	readability = collections.OrderedDict([
-			('Kincaid', KincaidGradeLevel(syllables, words, sentences)),
-			('ARI', ARI(characters, words, sentences)),
-			('Coleman-Liau',
-				ColemanLiauIndex(characters, words, sentences)),
-			('FleschReadingEase',
-				FleschReadingEase(syllables, words, sentences)),
-			('GunningFogIndex',
-				GunningFogIndex(words, complex_words, sentences)),
-			('LIX', LIX(words, long_words, sentences)),
-			('SMOGIndex', SMOGIndex(complex_words, sentences)),
-			('RIX', RIX(long_words, sentences)),
-			('REL', REL_score(syllables, words, sentences)),
-			('KandelMoles', KandelMoles(syllables, words, sentences)),
-		])
+	# Values in the order of the slots of the language schema (see Schema).
+	values = array('d', (
+			KincaidGradeLevel(syllables, words, sentences),
+			ARI(characters, words, sentences),
+			ColemanLiauIndex(characters, words, sentences),
+			FleschReadingEase(syllables, words, sentences),
+			GunningFogIndex(words, complex_words, sentences),
+			LIX(words, long_words, sentences),
+			SMOGIndex(complex_words, sentences),
+			RIX(long_words, sentences),
+			REL_score(syllables, words, sentences),
+			KandelMoles(syllables, words, sentences)))
 	if basicwords:
-		stats['complex_words_dc'] = complex_words_dc
-		readability['DaleChallIndex'] = DaleChallIndex(
-				words, complex_words_dc, sentences)
-
+		values.append(DaleChallIndex(words, complex_words_dc, sentences))
 		# Mesnager : Complex word count.
-		stats['complex_words_mes'] = complex_words_mes
-		readability['Mesnager'] = Mesnager(
-			complex_words_mes, words, sentences)
+		values.append(Mesnager(complex_words_mes, words, sentences))
+	values.extend((
+			characters / words,
+			syllables / words,
+			words / sentences,
+			sentences / paragraphs,
+			len(vocabulary) / words,
+			directspeech / sentences,
+			characters,
+			syllables,
+			words,
+			len(vocabulary),
+			sentences,
+			paragraphs,
+			long_words,
+			complex_words))
+	if basicwords:
+		values.extend((complex_words_dc, complex_words_mes))
+	values.extend(wordusage)
+	values.extend(beginnings)
 
+	result = Measures(getschema(lang), values)
+	if record:
+		return result
 	if merge:
-		readability.update(stats)
-		readability.update(wordusage)
-		readability.update(beginnings)
-		return readability
-	return collections.OrderedDict([
-			('readability grades', readability),
-			('sentence info', stats),
-			('word usage', wordusage),
-			('sentence beginnings', beginnings),
-			])
+		return result.merged()
+	return result.nested()
 
 
 def getdataframe(filenames, lang='en', encoding='utf8', tokenizer=None):
@@ -239,11 +353,77 @@ def getdataframe(filenames, lang='en', encoding='utf8', tokenizer=None):
 	import pandas
 	filenames = list(filenames)
 
-	return pandas.DataFrame([getmeasures(
-				applytokenizer(name, tokenizer, encoding),
-				lang=lang,
-				merge=True)
-			for name in filenames], index=filenames)
+	return pandas.DataFrame([record.merged() for _, record in itermeasures(
+				filenames, lang=lang, encoding=encoding, tokenizer=tokenizer)],
+			index=filenames)
+
+
+def itermeasures(filenames, lang='en', encoding='utf8', tokenizer=None):
+	"""Yield ``(filename, record)`` for each file as soon as it is processed.
+
+	:param filenames: an iterable of filenames; it is consumed lazily.
+	:returns: an iterator of filenames and :class:`Measures` records."""
+	for name in filenames:
+		yield name, getmeasures(applytokenizer(name, tokenizer, encoding),
+				lang=lang, record=True)
+
+
+def writecsv(results, out, lang='en'):
+	"""Write ``(filename, record)`` pairs as CSV rows, one at a time.
+
+	The columns are the same as those of :func:`getdataframe` ``.to_csv()``:
+	the keys of the merged dictionary, each once (``Schema.names``).
+	"""
+	names = getschema(lang).names
+	writer = csv.writer(out, lineterminator='\n')
+	writer.writerow(('', ) + names)
+	for filename, record in results:
+		writer.writerow([filename] + [record[name] for name in names])
+		out.flush()
+
+
+def writejsonl(results, out):
+	"""Write ``(filename, record)`` pairs as JSON Lines, one at a time."""
+	for filename, record in results:
+		row = collections.OrderedDict([('file', filename)])
+		row.update(record.merged())
+		out.write(json.dumps(row, ensure_ascii=False) + '\n')
+		out.flush()
+
+
+def writeparquet(results, path, lang='en', chunksize=1000):
+	"""Write ``(filename, record)`` pairs to a Parquet file, holding at most
+	``chunksize`` rows in memory (one row group per chunk).
+
+	The columns are ``file`` followed by the keys of the merged dictionary,
+	each once (``Schema.names``)."""
+	import pyarrow
+	import pyarrow.parquet
+	schema = getschema(lang)
+	arrowschema = pyarrow.schema([('file', pyarrow.string())] + [
+			(name, pyarrow.int64() if name in schema.counts
+				else pyarrow.float64())
+			for name in schema.names])
+	with pyarrow.parquet.ParquetWriter(path, arrowschema) as writer:
+		chunk = []
+		for result in results:
+			chunk.append(result)
+			if len(chunk) == chunksize:
+				writer.write_table(_arrowtable(chunk, arrowschema))
+				chunk = []
+		if chunk:
+			writer.write_table(_arrowtable(chunk, arrowschema))
+
+
+def _arrowtable(chunk, arrowschema):
+	import pyarrow
+	columns = [[filename for filename, _ in chunk]]
+	columns.extend([record[name] for _, record in chunk]
+			for name in arrowschema.names[1:])
+	return pyarrow.Table.from_arrays(
+			[pyarrow.array(column, type=field.type)
+				for column, field in zip(columns, arrowschema)],
+			schema=arrowschema)
 
 
 def applytokenizer(filename, tokenizer, encoding):
@@ -315,7 +495,8 @@ def Mesnager(complex_words_mes, words, sentences):
 
 def main():
 	shortoptions = 'hL:'
-	options = 'help csv lang= tokenizer='.split()
+	options = ('help csv jsonl parquet= chunk-size= files-from= lang= '
+			'tokenizer=').split()
 	cmd = os.path.basename(sys.argv[0])
 	usage = __doc__ % dict(cmd=cmd, lang=', '.join(LANGDATA))
 	try:
@@ -326,14 +507,31 @@ def main():
 	opts = dict(opts)
 	lang = opts.get('--lang', opts.get('-L', 'en'))
 
+	if '--files-from' in opts:
+		listfile = opts['--files-from']
+		lines = (io.TextIOWrapper(sys.stdin.buffer, encoding='utf8')
+				if listfile == '-' else io.open(listfile, encoding='utf8'))
+		args = (line.rstrip('\r\n') for line in lines if line.strip())
+
 	if '--help' in opts or '-h' in opts:
 		print(usage)
 		return
-	elif '--csv' in opts:
-		result = getdataframe(args, lang=lang,
+	elif '--csv' in opts or '--jsonl' in opts or '--parquet' in opts:
+		results = itermeasures(args, lang=lang,
 				tokenizer=opts.get('--tokenizer'))
-		result.to_csv(sys.stdout)
+		try:
+			if '--csv' in opts:
+				writecsv(results, sys.stdout, lang=lang)
+			elif '--jsonl' in opts:
+				writejsonl(results, sys.stdout)
+			else:
+				writeparquet(results, opts['--parquet'], lang=lang,
+						chunksize=int(opts.get('--chunk-size', 1000)))
+		except KeyboardInterrupt:
+			sys.exit(1)
 		return
+	elif '--files-from' in opts:
+		raise ValueError('--files-from requires --csv, --jsonl or --parquet.')
 	elif len(args) == 0 or args == ['-']:
 		text = io.TextIOWrapper(sys.stdin.buffer, encoding='utf8')
 	elif len(args) == 1:
@@ -350,7 +548,8 @@ def main():
 		sys.exit(1)
 
 
-__all__ = ['getmeasures', 'getdataframe']
+__all__ = ['getmeasures', 'getdataframe', 'itermeasures', 'getschema',
+		'Measures', 'Schema']
 
 if __name__ == "__main__":
 	main()
@@ -91,6 +91,32 @@ fallback_subsyl = [re.compile(a) for a in _fallback_subsyl]
 fallback_addsyl = [re.compile(a) for a in _fallback_addsyl]
 
 
+def _combineregexps(patterns):
+	"""Join regular expressions into a single alternation.
+
+	Backreferences are renumbered so that each alternative still refers to its
+	own groups. The result only tells whether *any* pattern matches; it is used
+	to skip the individual searches for the common case of no match."""
+	parts = []
+	offset = 0
+	for pattern in patterns:
+		parts.append('(?:%s)' % re.sub(
+				r'\\(\d)',
+				lambda m, offset=offset: '\\%d' % (int(m.group(1)) + offset),
+				pattern))
+		offset += re.compile(pattern).groups
+	return re.compile('|'.join(parts))
+
+
+fallback_anysubsyl = _combineregexps(_fallback_subsyl)
+fallback_anyaddsyl = _combineregexps(_fallback_addsyl)
+
+# A vowel group is a maximal run of vowels; in Dutch / German only groups
+# followed by a consonant are counted.
+VOWELGROUPS_EN = re.compile('[%sy]+' % VOWELS)
+VOWELGROUPS_NLDE = re.compile('[%s]+(?=[^%s])' % (VOWELS, VOWELS))
+
+
 def _normalize_word(word):
 	return word.strip().lower()
 
@@ -120,21 +146,17 @@ def countsyllables_en(word):
 		return fallback_cache[word]
 
 	# Count vowel groups
-	result = 0
-	prev_was_vowel = False
-	for char in word:
-		is_vowel = char in VOWELS or char == 'y'
-		if is_vowel and not prev_was_vowel:
-			result += 1
-		prev_was_vowel = is_vowel
+	result = len(VOWELGROUPS_EN.findall(word))
 
-	# Add & subtract syllables
-	for r in fallback_addsyl:
-		if r.search(word):
-			result += 1
-	for r in fallback_subsyl:
-		if r.search(word):
-			result -= 1
+	# Add & subtract syllables; most words match none of the patterns.
+	if fallback_anyaddsyl.search(word) is not None:
+		for r in fallback_addsyl:
+			if r.search(word):
+				result += 1
+	if fallback_anysubsyl.search(word) is not None:
+		for r in fallback_subsyl:
+			if r.search(word):
+				result -= 1
 
 	# Cache the syllable count
 	fallback_cache[word] = result
@@ -142,23 +164,31 @@ def countsyllables_en(word):
 	return result
 
 
+def countsyllables_en_batch(words):
+	"""Count syllables for a collection of unique English words.
+
+	:returns: a dictionary mapping each word to its syllable count."""
+	return {word: countsyllables_en(word) for word in words}
+
+
 def countsyllables_nlde(word):
 	"""Count syllables for Dutch / German words by counting vowel-consonant or
 	consonant-vowel pairs, depending on the first character being a vowel or
 	not. If it is, a trailing e will be handled with a special rule."""
-	result = 0
-	prev_was_vowel = word[0] in VOWELS
-	for char in word[1:]:
-		is_vowel = char in VOWELS
-		if prev_was_vowel and not is_vowel:
-			result += 1
-		prev_was_vowel = is_vowel
+	result = len(VOWELGROUPS_NLDE.findall(word))
 
 	if (len(word) > 1 and word[0] in VOWELS
 			and word.endswith('e') and not word[-2] in VOWELS):
 		result += 1
 	return result or 1
 
+
+def countsyllables_nlde_batch(words):
+	"""Count syllables for a collection of unique Dutch / German words.
+
+	:returns: a dictionary mapping each word to its syllable count."""
+	return {word: countsyllables_nlde(word) for word in words}
+
 # Using Pyphen hyphenation to count french syllables. (https://pyphen.org/)
 def count_syllables_fr(word):
 	import pyphen
@@ -167,6 +197,16 @@ def count_syllables_fr(word):
 	return max(1, len(dic.inserted(word).split('-')))
 
 
+def count_syllables_fr_batch(words):
+	"""Count syllables for a collection of unique French words, loading the
+	hyphenation dictionary only once.
+
+	:returns: a dictionary mapping each word to its syllable count."""
+	import pyphen
+	dic = pyphen.Pyphen(lang='fr')
+	return {word: max(1, len(dic.inserted(word).split('-'))) for word in words}
+
+
 conjuction_en = r'and|but|or|yet|nor'
 preposition_en = (
 		'board|about|above|according to|across from'
@@ -1408,22 +1448,26 @@ VRAIMENT VRAIS VU VUE VUES VUS Y -Y YEUX
 LANGDATA = dict(
 	en=dict(
 		syllables=countsyllables_en,
+		syllables_batch=countsyllables_en_batch,
 		words=words_en,
 		beginnings=beginnings_en,
 		basicwords=basicwords_en),
 	nl=dict(
 		syllables=countsyllables_nlde,
+		syllables_batch=countsyllables_nlde_batch,
 		words=words_nl,
 		beginnings=beginnings_nl,
 		basicwords=basicwords_nl),
 	de=dict(
 		syllables=countsyllables_nlde,
+		syllables_batch=countsyllables_nlde_batch,
 		words=words_de,
 		beginnings=beginnings_de,
 		basicwords=basicwords_de),
 	# Settings for when the input language is French:
 	fr=dict(
 		syllables=count_syllables_fr,
+		syllables_batch=count_syllables_fr_batch,
 		words=words_fr,
 		beginnings=beginnings_fr,
 		basicwords=basicwords_fr),
@@ -0,0 +1,92 @@
+import argparse
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from extract_readability import get_feature_matrix, diff_feature_matrices
+
+# Modèle secondaire qui prédit le score à partir des seules différences de
+# lisibilité (colonnes diff_*), sans embedding : ce module n'importe ni torch
+# ni transformers. Il est entraîné sur les mêmes cibles que le modèle complet :
+#
+#   python readability_only.py pairs.csv --compare
+#
+# pairs.csv contient les colonnes original, simplified et score. L'écart de
+# précision avec le modèle complet est mesuré sur les paires de test (voir
+# le README).
+MODEL_PATH = "readability_only_model.pkl"
+
+_model = None
+
+def load_model(path=MODEL_PATH):
+    global _model
+    if _model is None:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found; train it with: python readability_only.py pairs.csv")
+        _model = joblib.load(path)
+    return _model
+
+# Prédiction pour des différences de lisibilité (sortie de
+# extract_readability_features ou diff_readability_features_many)
+def predict(read_df):
+    model = load_model()
+    return model.predict(read_df[model.feature_names_in_])
+
+def readability_diffs(originals, simplifieds):
+    return diff_feature_matrices(get_feature_matrix(originals), get_feature_matrix(simplifieds))
+
+# Même architecture que le modèle complet ; les mesures, d'échelles très
+# différentes (nombre de caractères, ratios), sont standardisées
+def make_model(seed=0):
+    from sklearn.neural_network import MLPRegressor
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    return make_pipeline(StandardScaler(), MLPRegressor(
+        hidden_layer_sizes=(64, 32), activation="tanh", alpha=0.5,
+        early_stopping=True, max_iter=300, random_state=seed))
+
+def report(name, predictions, targets):
+    error = np.abs(predictions - targets)
+    r2 = 1 - ((predictions - targets) ** 2).sum() / ((targets - targets.mean()) ** 2).sum()
+    print(f"{name:>12} : MAE {error.mean():.3f}, R² {r2:.3f}")
+
+# Entraînement sur un quart de paires mises de côté pour l'évaluation, puis
+# sur l'ensemble des paires pour le modèle enregistré
+def train(pairs, path=MODEL_PATH, compare=False, seed=0):
+    read_df = readability_diffs(pairs["original"].tolist(), pairs["simplified"].tolist())
+    targets = pairs["score"].to_numpy(dtype=float)
+    order = np.random.default_rng(seed).permutation(len(pairs))
+    n_test = len(order) // 4
+    test, fit = order[:n_test], order[n_test:]
+
+    if n_test:
+        held_out = make_model(seed).fit(read_df.iloc[fit], targets[fit])
+        print(f"{n_test} paires de test")
+        report("lisibilité", held_out.predict(read_df.iloc[test]), targets[test])
+        if compare:
+            # Le modèle complet n'a pas été entraîné sur ce découpage : sa
+            # mesure n'est indicative que si les paires sont nouvelles pour lui
+            from scoring import score_pairs
+            full = score_pairs(pairs["original"].iloc[test], pairs["simplified"].iloc[test], tier="accurate")
+            report("complet", full["score"].to_numpy(), targets[test])
+
+    model = make_model(seed).fit(read_df, targets)
+    joblib.dump(model, path)
+    global _model
+    _model = None
+    return model
+
+def main():
+    parser = argparse.ArgumentParser(description="Entraînement du modèle de lisibilité seule.")
+    parser.add_argument("pairs", help="fichier CSV de paires (colonnes original, simplified, score)")
+    parser.add_argument("--output", default=MODEL_PATH)
+    parser.add_argument("--compare", action="store_true",
+                        help="évaluer aussi le modèle complet sur les paires de test (importe torch)")
+    args = parser.parse_args()
+    pairs = pd.read_csv(args.pairs)
+    pairs[["original", "simplified"]] = pairs[["original", "simplified"]].astype(str)
+    train(pairs, args.output, args.compare)
+    print(f"modèle -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import os
+import warnings
+import threading
+from concurrent.futures import Future
+import numpy as np
+import pandas as pd
+from model_artifacts import ARTIFACTS_PATH, load as load_artifacts
+from extract_readability import (DIFF_COLUMNS, get_features, diff_pair_matrix, pair_errors,
+                                 diff_readability_features)
+
+# Les encodeurs (extract_plongements_camembert, fast_tier) ne sont importés
+# qu'au moment de s'en servir : le niveau « readability » n'importe jamais
+# torch ni transformers.
+
+# Niveau de score : "accurate" (CamemBERT-base), "fast" (encodeur distillé,
+# voir fast_tier), "readability" (mesures de lisibilité seules, voir
+# readability_only) ou "auto" : le niveau rapide est choisi pour les lots d'au
+# moins FAST_TIER_MIN_PAIRS paires, quand sa projection a été apprise
+SCORING_TIER = os.environ.get("SCORING_TIER", "accurate")
+FAST_TIER_MIN_PAIRS = 256
+
+# Chargement des modèles : depuis leur export .npz (voir model_artifacts),
+# plus rapide et sans pickle, quand il correspond aux .pkl ; depuis les .pkl
+# sinon
+MODEL_PATH = "mlp_exp_max_rev_read_model.pkl"
+PCA_PATH = "pca_model_max_rev.pkl"
+
+def load_models():
+    if os.path.exists(ARTIFACTS_PATH):
+        try:
+            return load_artifacts(ARTIFACTS_PATH, MODEL_PATH, PCA_PATH)
+        except ValueError as err:
+            warnings.warn(str(err))
+    import joblib
+    return joblib.load(MODEL_PATH), joblib.load(PCA_PATH)
+
+model, pca = load_models()
+
+# Précision des embeddings et de leur projection PCA : "float64" (chemin de
+# référence, par pca.transform), "float32" ou "float16". En float16 les
+# matrices sont stockées en demi-précision mais le produit matriciel est
+# calculé en float32. benchmarks/validate_precision.py mesure l'écart des
+# scores par rapport au chemin float64.
+FEATURE_DTYPE = os.environ.get("FEATURE_DTYPE", "float64")
+
+# Paramètres de la PCA convertis une fois par précision
+_pca_params = {}
+
+def _pca_params_for(dtype):
+    if dtype not in _pca_params:
+        _pca_params[dtype] = (pca.mean_.astype(dtype), np.ascontiguousarray(pca.components_.T, dtype=dtype))
+    return _pca_params[dtype]
+
+# Projection PCA des différences d'embedding dans la précision demandée
+def project_embeddings(emb, dtype=None):
+    dtype = np.dtype(dtype or FEATURE_DTYPE)
+    if dtype == np.float64:
+        return pca.transform(emb)
+    compute_dtype = np.float32 if dtype == np.float16 else dtype
+    mean, components = _pca_params_for(compute_dtype)
+    emb = emb.to_numpy() if isinstance(emb, pd.DataFrame) else np.asarray(emb)
+    return ((emb.astype(compute_dtype, copy=False) - mean) @ components).astype(dtype, copy=False)
+
+# Différences d'embedding (simplifiée - originale) dans la précision demandée,
+# une ligne par paire. La soustraction se fait dans la précision des vecteurs
+# de l'encodeur et seule la différence est convertie : en float16, soustraire
+# deux vecteurs proches déjà arrondis perdrait une bonne part de leur écart.
+def embedding_diffs(ori_vectors, sim_vectors, dtype=None):
+    diff = np.atleast_2d(np.asarray(sim_vectors) - np.asarray(ori_vectors))
+    dtype = np.dtype(dtype or FEATURE_DTYPE)
+    if dtype != np.float64:
+        diff = diff.astype(dtype, copy=False)
+    return pd.DataFrame(diff, columns=[f"max_{i}" for i in range(diff.shape[1])])
+
+# Assemblage des caractéristiques : projection PCA des embeddings + lisibilité
+def build_features(emb_df, read_df, dtype=None):
+    emb_pca = pd.DataFrame(project_embeddings(emb_df, dtype), columns=[f"pca_{i+1}" for i in range(pca.n_components_)])
+    return pd.concat([emb_pca, read_df.reset_index(drop=True)], axis=1)
+
+# Lance fn dans un thread dédié et renvoie son Future. Un thread par appel :
+# les sessions concurrentes ne se mettent pas en file derrière un thread
+# partagé, et rien de ce qu'on y rattache ne survit à l'appel.
+# prepare_thread(thread) est appelé avant le démarrage (par exemple
+# add_script_run_ctx, pour rattacher le thread à la session Streamlit).
+def _start_branch(fn, prepare_thread=None):
+    future = Future()
+    def run():
+        try:
+            future.set_result(fn())
+        except BaseException as err:
+            future.set_exception(err)
+    thread = threading.Thread(target=run, name="readability", daemon=True)
+    if prepare_thread is not None:
+        prepare_thread(thread)
+    thread.start()
+    return future
+
+# Score d'une paire : la branche lisibilité (spaCy) tourne dans un thread
+# pendant que la branche embeddings (CamemBERT) s'exécute dans le thread
+# appelant ; torch relâche le GIL pendant le calcul, la latence est donc celle
+# de la branche la plus lente et non leur somme. Les deux branches se
+# rejoignent à l'assemblage des caractéristiques.
+# features_fn / embedding_fn remplacent get_features / get_embedding (par
+# exemple par des versions mises en cache) ; prepare_thread est appliqué au
+# thread de la branche lisibilité avant son démarrage (voir _start_branch).
+# Renvoie (score, caractéristiques) ; les caractéristiques sont vides pour une
+# paire identique, et réduites aux différences de lisibilité quand le score
+# vient du cache des prédictions (cache, voir prediction_cache).
+def predict_pair(original, simplified, dtype=None, features_fn=None, embedding_fn=None, cache=None,
+                 prepare_thread=None):
+    if original.strip() == simplified.strip():
+        return 0.0, pd.DataFrame()
+    if cache is not None:
+        key = cache.key(original, simplified, "accurate", np.dtype(dtype or FEATURE_DTYPE).name)
+        entry = cache.get_many([key]).get(key)
+        if entry is not None:
+            return entry[0], pd.DataFrame([entry[1]])
+    features_fn = features_fn or get_features
+    if embedding_fn is None:
+        from extract_plongements_camembert import get_embedding as embedding_fn
+    from extract_plongements_camembert import diff_embeddings
+
+    read_future = _start_branch(
+        lambda: diff_readability_features(features_fn(original), features_fn(simplified)),
+        prepare_thread)
+    emb_df = diff_embeddings(embedding_fn(original), embedding_fn(simplified))
+    read_df = read_future.result()
+    features = build_features(emb_df, read_df, dtype)
+    score = model.predict(features)[0]
+    if cache is not None:
+        cache.put_many([(key, "accurate", score, read_df.iloc[0].to_dict())])
+    return score, features
+
+# Score de plusieurs simplifications d'une même phrase originale, triées du
+# meilleur au moins bon score ; l'index conserve la position de chaque candidate.
+# Comme dans score_pairs, une candidate vide ou sans aucun mot (ou une
+# originale vide) n'est pas évaluée : son score est NaN, elle est classée en
+# dernier et la colonne error indique pourquoi.
+# store : stock d'embeddings précalculés des originales (voir embedding_store)
+def score_candidates(original, candidates, store=None, dtype=None):
+    candidates = list(candidates)
+    diffs = diff_pair_matrix([original] * len(candidates), candidates)
+    valid = ~np.isnan(diffs).any(axis=1)
+    scores = pd.Series(np.where(valid, 0.0, np.nan), index=range(len(candidates)))
+
+    # Une candidate identique à l'originale n'apporte aucune amélioration
+    changed = [i for i, text in enumerate(candidates) if valid[i] and text.strip() != original.strip()]
+    if changed:
+        from extract_plongements_camembert import extract_camembert_diffs
+        emb_df = extract_camembert_diffs(original, [candidates[i] for i in changed], store=store)
+        read_df = pd.DataFrame(diffs[changed], columns=DIFF_COLUMNS)
+        scores[changed] = model.predict(build_features(emb_df, read_df, dtype))
+
+    ranked = pd.DataFrame({"simplified": candidates, "score": scores,
+                           "error": pair_errors([original] * len(candidates), candidates, diffs)})
+    return ranked.sort_values("score", ascending=False, kind="stable")
+
+# Niveau effectivement utilisé pour un lot de n_pairs paires
+def choose_tier(n_pairs, tier=None):
+    tier = tier or SCORING_TIER
+    if tier == "auto":
+        import fast_tier
+        return "fast" if n_pairs >= FAST_TIER_MIN_PAIRS and fast_tier.is_available() else "accurate"
+    if tier not in ("accurate", "fast", "readability"):
+        raise ValueError(f"unknown scoring tier: {tier!r}")
+    return tier
+
+# Score d'une liste de paires (originale, simplifiée) quelconques : chaque texte
+# distinct n'est analysé et encodé qu'une fois, par lots, avec l'encodeur du
+# niveau choisi (voir choose_tier).
+# Renvoie les colonnes original, simplified, score, error puis les différences
+# de lisibilité, dans l'ordre des paires. Une paire dont un texte est vide ou
+# ne contient aucun mot n'est pas évaluée : son score et ses différences sont
+# NaN et error indique pourquoi (None pour les autres paires).
+# cache : cache persistant des prédictions (voir prediction_cache) ; seules
+# les paires absentes du cache sont évaluées.
+def score_pairs(originals, simplifieds, dtype=None, tier=None, cache=None):
+    pairs = pd.DataFrame({"original": list(originals), "simplified": list(simplifieds)})
+    if cache is not None:
+        return _score_pairs_cached(pairs, dtype, tier, cache)
+    diffs = diff_pair_matrix(pairs["original"], pairs["simplified"])
+    scores = np.where(np.isnan(diffs).any(axis=1), np.nan, 0.0)
+
+    # Une paire identique n'apporte aucune amélioration
+    changed = (pairs["original"].str.strip() != pairs["simplified"].str.strip()).to_numpy() & ~np.isnan(scores)
+    if changed.any():
+        ori_texts = pairs["original"][changed].tolist()
+        sim_texts = pairs["simplified"][changed].tolist()
+        changed_read_df = pd.DataFrame(diffs[changed], columns=DIFF_COLUMNS)
+
+        tier = choose_tier(len(ori_texts), tier)
+        if tier == "readability":
+            import readability_only
+            scores[changed] = readability_only.predict(changed_read_df)
+        else:
+            texts = list(dict.fromkeys(ori_texts + sim_texts))
+            rows = {text: i for i, text in enumerate(texts)}
+            if tier == "fast":
+                import fast_tier
+                vectors = fast_tier.get_embeddings(texts)
+            else:
+                from extract_plongements_camembert import get_embeddings
+                vectors = get_embeddings(texts)
+            emb_df = embedding_diffs(vectors[[rows[text] for text in ori_texts]],
+                                     vectors[[rows[text] for text in sim_texts]], dtype)
+            scores[changed] = model.predict(build_features(emb_df, changed_read_df, dtype))
+
+    pairs["score"] = scores
+    pairs["error"] = pair_errors(pairs["original"], pairs["simplified"], diffs)
+    return pd.concat([pairs, pd.DataFrame(diffs, index=pairs.index, columns=DIFF_COLUMNS)], axis=1)
+
+def _score_pairs_cached(pairs, dtype, tier, cache):
+    tier = choose_tier(len(pairs), tier)
+    dtype = np.dtype(dtype or FEATURE_DTYPE).name
+    keys = [cache.key(original, simplified, tier, dtype)
+            for original, simplified in zip(pairs["original"], pairs["simplified"])]
+    entries = cache.get_many(keys)
+
+    # Paires absentes du cache, une seule fois chacune
+    missing = {}
+    for i, key in enumerate(keys):
+        if key not in entries:
+            missing.setdefault(key, i)
+    # Paires non évaluables : jamais mises en cache
+    errors = {}
+    if missing:
+        rows = list(missing.values())
+        scored = score_pairs(pairs["original"].iloc[rows], pairs["simplified"].iloc[rows], dtype, tier)
+        fresh = {}
+        for key, score, error, values in zip(missing, scored["score"], scored["error"],
+                                             scored[DIFF_COLUMNS].itertuples(index=False)):
+            if pd.isna(error):
+                fresh[key] = (score, dict(zip(DIFF_COLUMNS, values)))
+            else:
+                errors[key] = error
+        cache.put_many((key, tier, score, features) for key, (score, features) in fresh.items())
+        entries.update(fresh)
+
+    pairs["score"] = [entries[key][0] if key in entries else np.nan for key in keys]
+    pairs["error"] = [errors.get(key) for key in keys]
+    # Les paires identiques n'ont pas de différences enregistrées : elles valent 0
+    read_df = pd.DataFrame([entries[key][1] if key in entries else {} for key in keys], index=pairs.index,
+                           columns=DIFF_COLUMNS).fillna(0.0)
+    read_df[pairs["error"].notna().to_numpy()] = np.nan
+    return pd.concat([pairs, read_df], axis=1)
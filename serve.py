@@ -0,0 +1,33 @@
+import argparse
+import os
+import sys
+import threading
+from warmup import READINESS_PORT_ENV, ensure_warm, serve_readiness
+
+# Lancement de l'application pour la production. Streamlit n'exécute
+# streamlit_app.py qu'à la connexion du premier navigateur : lancée par
+# streamlit run, l'instance resterait froide (et sans sonde) jusque-là. Ici la
+# sonde de disponibilité et le préchauffage démarrent avec le processus
+# serveur, avant toute session ; le serveur Streamlit tourne dans le même
+# processus et l'application réutilise les modèles déjà préchauffés.
+#
+#   python serve.py --readiness-port 8502 [options de streamlit run]
+#
+# /ready répond 503 pendant le préchauffage puis 200 (voir warmup).
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+
+def main():
+    parser = argparse.ArgumentParser(description="Lancement de l'application avec préchauffage au démarrage.")
+    parser.add_argument("--readiness-port", type=int, default=os.environ.get(READINESS_PORT_ENV),
+                        help=f"port de la sonde de disponibilité (par défaut ${READINESS_PORT_ENV})")
+    args, streamlit_args = parser.parse_known_args()
+
+    serve_readiness(args.readiness_port)
+    threading.Thread(target=ensure_warm, name="warmup", daemon=True).start()
+
+    from streamlit.web import cli
+    sys.argv = ["streamlit", "run", APP_PATH] + streamlit_args
+    cli.main()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import multiprocessing as mp
+import queue
+from multiprocessing import shared_memory
+import numpy as np
+
+# Transport de matrices entre processus par mémoire partagée, sans sérialiser
+# les tableaux NumPy dans une file.
+# Un anneau (SharedRing) est un bloc multiprocessing.shared_memory découpé en
+# n_slots cases de forme fixe (lignes max, colonnes). Le producteur écrit ses
+# lignes dans une case libre ; seuls l'indice de la case, le nombre de lignes
+# et une petite métadonnée passent par les files. Le consommateur lit la case
+# sur place puis la libère. Quand toutes les cases sont occupées, le
+# producteur attend : la mémoire utilisée est bornée.
+#
+#   ring = SharedRing(4, (64, 768))           # dans le processus parent
+#   ring.put(matrix, meta=chunk_index)        # dans le processus producteur
+#   slot, rows, meta = ring.get()             # dans le processus consommateur
+#   ...                                       # rows est une vue sur la case
+#   ring.release(slot)
+
+# Délai entre deux vérifications de l'état des producteurs pendant une attente
+POLL_SECONDS = 1.0
+
+# Les processus enfants partagent le resource_tracker du parent : le bloc n'y
+# est enregistré qu'une fois et seul le parent (propriétaire) le détruit
+def _attach(name):
+    return shared_memory.SharedMemory(name=name)
+
+class SharedRing:
+    def __init__(self, n_slots, slot_shape, dtype=np.float32, ctx=None):
+        ctx = ctx or mp.get_context()
+        self.n_slots = n_slots
+        self.slot_shape = tuple(slot_shape)
+        self.dtype = np.dtype(dtype)
+        size = n_slots * int(np.prod(self.slot_shape)) * self.dtype.itemsize
+        self._shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self._owner = True
+        self._free = ctx.Queue()
+        self._full = ctx.Queue()
+        for slot in range(n_slots):
+            self._free.put(slot)
+        self._map()
+
+    def _map(self):
+        self._slots = np.ndarray((self.n_slots,) + self.slot_shape, dtype=self.dtype, buffer=self._shm.buf)
+
+    # Transmis aux processus enfants : ils s'attachent au même bloc par son nom
+    def __getstate__(self):
+        return {"name": self._shm.name, "n_slots": self.n_slots, "slot_shape": self.slot_shape,
+                "dtype": self.dtype.str, "free": self._free, "full": self._full}
+
+    def __setstate__(self, state):
+        self.n_slots = state["n_slots"]
+        self.slot_shape = state["slot_shape"]
+        self.dtype = np.dtype(state["dtype"])
+        self._free = state["free"]
+        self._full = state["full"]
+        self._shm = _attach(state["name"])
+        self._owner = False
+        self._map()
+
+    # Écriture d'une matrice (au plus slot_shape[0] lignes) dans une case libre
+    def put(self, array, meta=None):
+        rows = len(array)
+        if rows > self.slot_shape[0]:
+            raise ValueError(f"{rows} rows do not fit in a slot of {self.slot_shape[0]}")
+        slot = self._free.get()
+        self._slots[slot, :rows] = array
+        self._full.put((slot, rows, meta))
+
+    # Signale au consommateur la fin du flux
+    def close_stream(self):
+        self._full.put(None)
+
+    # Prochaine case remplie : (slot, vue sur les lignes, meta), ou None en fin
+    # de flux. Si des processus producteurs sont donnés, une erreur est levée
+    # quand l'un d'eux s'arrête anormalement au lieu d'attendre indéfiniment.
+    def get(self, producers=()):
+        while True:
+            try:
+                item = self._full.get(timeout=POLL_SECONDS)
+                break
+            except queue.Empty:
+                for proc in producers:
+                    if not proc.is_alive() and proc.exitcode:
+                        raise RuntimeError(f"{proc.name} exited with code {proc.exitcode}")
+        if item is None:
+            return None
+        slot, rows, meta = item
+        return slot, self._slots[slot, :rows], meta
+
+    def release(self, slot):
+        self._free.put(slot)
+
+    def close(self):
+        self._slots = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,8 +1,12 @@
 import streamlit as st
 import pandas as pd
-import joblib
-from extract_readability import extract_readability_features
-from extract_plongements_camembert import extract_camembert_diff
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+from extract_readability import get_features
+from extract_plongements_camembert import get_embedding
+from jobs import read_pairs
+from prediction_cache import get_cache
+from scoring import predict_pair, score_pairs
+from warmup import ensure_warm
 import spacy
 
 # Dictionnaire pour rendre les noms de caractéristiques plus lisibles avec explications
@@ -77,9 +81,81 @@ except:
     spacy.cli.download("fr_core_news_sm")
     nlp = spacy.load("fr_core_news_sm")
 
-# Load models
-model = joblib.load("mlp_exp_max_rev_read_model.pkl")
-pca = joblib.load("pca_model_max_rev.pkl")
+# Préchauffage avant la première prédiction. Lancée par serve.py, l'application
+# trouve le préchauffage déjà fait (ou l'attend) ; lancée par streamlit run, il
+# a lieu à la première session.
+@st.cache_resource(show_spinner="Préchauffage des modèles…")
+def warm_up():
+    ensure_warm()
+
+warm_up()
+
+# Mesures et embedding de chaque phrase, mis en cache séparément : quand
+# l'utilisateur modifie seulement la phrase simplifiée, seule celle-ci est
+# analysée à nouveau (le cache est partagé entre les sessions)
+@st.cache_data(max_entries=1000, show_spinner=False)
+def side_features(text):
+    return get_features(text)
+
+@st.cache_data(max_entries=1000, show_spinner=False)
+def side_embedding(text):
+    return get_embedding(text)
+
+# Nombre de paires traitées entre deux mises à jour du tableau en mode fichier
+BATCH_CHUNK_SIZE = 32
+
+# Mode fichier : les paires sont évaluées par lots, le tableau des résultats
+# est complété au fur et à mesure. Chaque lot évalué est ajouté à l'état de
+# session dès qu'il est terminé : une interaction pendant l'évaluation relance
+# le script, qui reprend après le dernier lot enregistré au lieu de repartir
+# de zéro.
+def batch_mode():
+    st.title("Prédiction de l'amélioration de lisibilité")
+    st.write("Chargez un fichier **CSV** ou **XLSX** contenant une colonne `original` et une colonne `simplified`. "
+             "Les paires dont une phrase est vide ou ne contient aucun mot ne sont pas évaluées : "
+             "leur colonne `error` en donne la raison.")
+    uploaded = st.file_uploader("Fichier de paires", type=["csv", "xlsx"])
+
+    if uploaded is not None and st.button("Prédire le fichier"):
+        st.session_state["batch"] = {"file_id": uploaded.file_id, "pairs": read_pairs(uploaded), "results": []}
+        st.session_state.pop("batch_results", None)
+
+    # Une évaluation en cours n'est reprise que pour le fichier qui l'a lancée
+    batch = st.session_state.get("batch")
+    if batch is not None and (uploaded is None or uploaded.file_id != batch["file_id"]):
+        del st.session_state["batch"]
+        batch = None
+
+    if batch is not None:
+        pairs, results = batch["pairs"], batch["results"]
+        progress = st.progress(0.0, text="Évaluation des paires…")
+        table = st.empty()
+        for start in range(sum(len(result) for result in results), len(pairs), BATCH_CHUNK_SIZE):
+            chunk = pairs.iloc[start:start + BATCH_CHUNK_SIZE]
+            results.append(score_pairs(chunk["original"], chunk["simplified"], cache=get_cache()).set_axis(chunk.index))
+            scored = pd.concat(results)
+            table.dataframe(scored[["original", "simplified", "score", "error"]].round(3), use_container_width=True)
+            progress.progress(len(scored) / len(pairs), text=f"{len(scored)} / {len(pairs)} paires évaluées")
+        table.empty()
+        progress.empty()
+        scored = pd.concat(results) if results else pairs.assign(score=[], error=[])
+        # Les résultats sont conservés pour survivre au rechargement provoqué
+        # par le bouton de téléchargement
+        # Les colonnes d'entrée homonymes des résultats (original, simplified,
+        # mais aussi score, error…) sont remplacées et non dupliquées
+        st.session_state["batch_results"] = pd.concat(
+            [pairs.drop(columns=scored.columns, errors="ignore"), scored], axis=1)
+        del st.session_state["batch"]
+
+    if "batch_results" in st.session_state:
+        scored = st.session_state["batch_results"]
+        st.dataframe(scored.round(3), use_container_width=True)
+        st.download_button("Télécharger les résultats (CSV)", scored.to_csv(index=False).encode("utf-8"),
+                           file_name="scores.csv", mime="text/csv")
+
+if st.sidebar.radio("Mode", ["Une paire", "Fichier de paires"]) == "Fichier de paires":
+    batch_mode()
+    st.stop()
 
 # App layout
 st.title("Prédiction de l'amélioration de lisibilité")
@@ -88,16 +164,18 @@ st.write("Entrez une phrase **originale** et sa version **simplifiée**.")
 original = st.text_area("Phrase originale")
 simplified = st.text_area("Phrase simplifiée")
 
-if st.button("Prédire"):
-    if original.strip() == simplified.strip():
-        value = 0.0
-        features = pd.DataFrame()
-    else:
-        emb_df = extract_camembert_diff(original, simplified)
-        emb_pca = pd.DataFrame(pca.transform(emb_df), columns=[f"pca_{i+1}" for i in range(pca.n_components_)])
-        read_df = extract_readability_features(original, simplified)
-        features = pd.concat([emb_pca, read_df], axis=1)
-        value = model.predict(features)[0]
+# En mode direct, le score est recalculé à chaque validation d'une zone de
+# texte (Ctrl+Entrée ou sortie du champ), sans appuyer sur « Prédire »
+live = st.toggle("Score en direct")
+
+if st.button("Prédire") or (live and original.strip() and simplified.strip()):
+    value, features = predict_pair(original, simplified,
+                                   features_fn=side_features, embedding_fn=side_embedding,
+                                   cache=get_cache(),
+                                   # side_features tourne dans le thread de lisibilité de
+                                   # predict_pair : il est rattaché à la session courante
+                                   # avant son démarrage pour que le cache y fonctionne
+                                   prepare_thread=add_script_run_ctx)
     
     st.subheader(f"Score prédit : {round(value, 2)}")
     st.markdown(
@@ -0,0 +1,39 @@
+"""Shared fixtures for the scoring tests."""
+import sys
+import types
+import zlib
+
+import numpy as np
+import pytest
+
+HIDDEN_SIZE = 768
+
+
+def _vector(text):
+    # Vecteur déterministe par texte, décalé comme les vecteurs max-poolés
+    rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+    return rng.normal(1.5, 0.5, HIDDEN_SIZE).astype(np.float32)
+
+
+def _get_embeddings(texts, batch_size=None, max_tokens=None):
+    return np.stack([_vector(text) for text in texts]) if texts else np.empty((0, HIDDEN_SIZE), np.float32)
+
+
+def _diff_embeddings(ori_vec, sim_vec):
+    import pandas as pd
+    diff = np.atleast_2d(sim_vec - ori_vec)
+    return pd.DataFrame(diff, columns=[f"max_{i}" for i in range(diff.shape[1])])
+
+
+@pytest.fixture
+def fake_encoder(monkeypatch):
+    """Replace extract_plongements_camembert, which loads CamemBERT on
+    import, with a deterministic encoder that needs no torch."""
+    module = types.ModuleType("extract_plongements_camembert")
+    module.get_embeddings = _get_embeddings
+    module.get_embedding = _vector
+    module.diff_embeddings = _diff_embeddings
+    module.extract_camembert_diffs = lambda original, candidates, store=None: _diff_embeddings(
+        _vector(original), _get_embeddings(list(candidates)))
+    monkeypatch.setitem(sys.modules, "extract_plongements_camembert", module)
+    return module
@@ -0,0 +1,67 @@
+"""Tests for the NumPy IVF index of ann_index."""
+import numpy as np
+import pytest
+
+from ann_index import IVFIndex
+
+DIM = 32
+
+
+def clustered_vectors(n, n_clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, DIM))
+    return (centers[rng.integers(n_clusters, size=n)] + 0.3 * rng.standard_normal((n, DIM))).astype(np.float32)
+
+
+def exact_search(vectors, query, k):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.argsort(-(normalized @ (query / np.linalg.norm(query))), kind="stable")[:k]
+
+
+def test_empty_store_is_rejected():
+    with pytest.raises(ValueError):
+        IVFIndex.build(np.empty((0, DIM), dtype=np.float32))
+
+
+@pytest.mark.parametrize("n, n_lists", [(1, None), (1, 5), (3, 10), (4, 4)])
+def test_tiny_stores(n, n_lists):
+    vectors = clustered_vectors(n)
+    index = IVFIndex.build(vectors, n_lists=n_lists)
+    assert len(index) == n
+    assert len(index.centroids) <= n
+    assert sorted(index.rows) == list(range(n))
+    rows, similarities = index.search(vectors[0], k=5, n_probe=len(index.centroids))
+    assert rows[0] == 0 and len(rows) == n
+    assert similarities[0] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_duplicate_vectors():
+    vectors = np.concatenate([np.tile(clustered_vectors(1), (50, 1)), clustered_vectors(5, seed=1)])
+    index = IVFIndex.build(vectors, n_lists=8)
+    assert np.isfinite(index.centroids).all()
+    assert index.offsets[-1] == len(vectors)
+    rows, similarities = index.search(vectors[0], k=10, n_probe=len(index.centroids))
+    assert set(rows) <= set(range(50))
+    np.testing.assert_allclose(similarities, 1.0, atol=1e-5)
+
+
+def test_build_and_load(tmp_path):
+    vectors = clustered_vectors(500)
+    built = IVFIndex.build(vectors, path=str(tmp_path))
+    loaded = IVFIndex.load(str(tmp_path))
+    for query in vectors[:10]:
+        np.testing.assert_array_equal(built.search(query)[0], loaded.search(query)[0])
+
+
+def test_recall_against_exact_search():
+    vectors = clustered_vectors(5000)
+    queries = clustered_vectors(100, seed=2)
+    index = IVFIndex.build(vectors)
+    k = 5
+    hits = sum(len(set(index.search(query, k=k, n_probe=16)[0]) & set(exact_search(vectors, query, k)))
+               for query in queries)
+    assert hits / (k * len(queries)) >= 0.95
+    # Avec toutes les listes, la recherche est exacte
+    for query in queries[:10]:
+        rows, _ = index.search(query, k=k, n_probe=len(index.centroids))
+        np.testing.assert_array_equal(rows, exact_search(vectors, query, k))
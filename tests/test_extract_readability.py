@@ -0,0 +1,27 @@
+"""Tests for the pair-level readability differences of extract_readability."""
+import numpy as np
+import pytest
+
+pytest.importorskip("fr_core_news_sm")
+
+from extract_readability import (DIFF_COLUMNS, EMPTY_TEXT, NO_WORDS, diff_pair_matrix,
+                                 get_feature_matrix, pair_errors)
+
+ORIGINALS = ["Le chat, qui était fatigué, dormait.", "Le chat dort.", "", "...", "Il pleut.", "", "—"]
+SIMPLIFIEDS = ["Le chat dormait.", "", "Le chien court.", "Le chien court.", "!!!", "", "—"]
+
+
+def test_diff_pair_matrix_marks_unscorable_pairs():
+    diffs = diff_pair_matrix(ORIGINALS, SIMPLIFIEDS)
+    assert diffs.shape == (len(ORIGINALS), len(DIFF_COLUMNS))
+    feats = get_feature_matrix(ORIGINALS[:1] + SIMPLIFIEDS[:1])
+    np.testing.assert_array_equal(diffs[0], feats[1] - feats[0])
+    assert np.isnan(diffs[1:6]).all()
+    # Une paire identique vaut 0 sans être analysée, même sans aucun mot
+    np.testing.assert_array_equal(diffs[6], 0.0)
+
+
+def test_pair_errors():
+    diffs = diff_pair_matrix(ORIGINALS, SIMPLIFIEDS)
+    assert pair_errors(ORIGINALS, SIMPLIFIEDS, diffs) == [
+        None, EMPTY_TEXT, EMPTY_TEXT, NO_WORDS, NO_WORDS, EMPTY_TEXT, None]
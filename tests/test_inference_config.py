@@ -0,0 +1,23 @@
+"""Tests for the core partitioning of inference_config."""
+import pytest
+
+pytest.importorskip("torch")
+
+import inference_config
+from inference_config import partition_cores, pin_worker
+
+
+def test_partition_cores():
+    assert partition_cores(3, range(8)) == [[0, 1, 2], [3, 4, 5], [6, 7]]
+    # Jamais plus de groupes que de cœurs
+    assert partition_cores(4, [0, 1]) == [[0], [1]]
+
+
+def test_pin_worker_more_workers_than_cores(monkeypatch):
+    pinned = []
+    monkeypatch.setattr(inference_config.os, "sched_setaffinity", lambda pid, group: pinned.append(group),
+                        raising=False)
+    monkeypatch.setattr(inference_config, "configure_threads", lambda intra_op, inter_op: None)
+    groups = [pin_worker(i, 4, cores=[0, 1]) for i in range(4)]
+    assert groups == [[0], [1], [0], [1]]
+    assert pinned == groups
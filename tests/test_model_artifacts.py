@@ -0,0 +1,46 @@
+"""Tests for the flat .npz export of the PCA and MLP."""
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+joblib = pytest.importorskip("joblib")
+
+import model_artifacts
+
+MODEL_PATH = "mlp_exp_max_rev_read_model.pkl"
+PCA_PATH = "pca_model_max_rev.pkl"
+
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("artifacts") / "model_artifacts.npz")
+    model_artifacts.export(MODEL_PATH, PCA_PATH, path)
+    return path
+
+
+def test_export_matches_pickles(exported):
+    ref_model, ref_pca = joblib.load(MODEL_PATH), joblib.load(PCA_PATH)
+    model, pca = model_artifacts.load(exported, MODEL_PATH, PCA_PATH)
+    rng = np.random.default_rng(0)
+    n = 200
+    emb = pd.DataFrame(rng.standard_normal((n, len(ref_pca.feature_names_in_))) * 0.1,
+                       columns=ref_pca.feature_names_in_)
+    read = pd.DataFrame(rng.standard_normal((n, len(ref_model.feature_names_in_) - ref_pca.n_components_)) * 5,
+                        columns=ref_model.feature_names_in_[ref_pca.n_components_:])
+    for dtype in (np.float64, np.float32):
+        projected = pca.transform(emb.astype(dtype))
+        np.testing.assert_array_equal(projected, ref_pca.transform(emb.astype(dtype)))
+        features = pd.concat([pd.DataFrame(projected, columns=ref_model.feature_names_in_[:ref_pca.n_components_]),
+                              read], axis=1)
+        np.testing.assert_array_equal(model.predict(features), ref_model.predict(features))
+
+
+def test_stale_export_is_rejected(exported, tmp_path):
+    model_path = tmp_path / MODEL_PATH
+    shutil.copy(MODEL_PATH, model_path)
+    with open(model_path, "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(ValueError):
+        model_artifacts.load(exported, str(model_path), PCA_PATH)
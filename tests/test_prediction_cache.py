@@ -0,0 +1,92 @@
+"""Tests for the persistent prediction cache, through score_pairs."""
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+scoring = pytest.importorskip("scoring")
+
+from prediction_cache import PredictionCache
+
+ORIGINALS = ["Le chat, qui était très fatigué, dormait sur le canapé.",
+             "Les intempéries ont provoqué d'importantes perturbations.",
+             "Le chat, qui était très fatigué, dormait sur le canapé."]
+SIMPLIFIEDS = ["Le chat dormait.", "Il y a des retards à cause du temps.", "Le chat dormait."]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PredictionCache(str(tmp_path / "predictions.sqlite"))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def computed(monkeypatch):
+    """Record the pairs that score_pairs actually scores (cache misses)."""
+    calls = []
+    score_pairs = scoring.score_pairs
+
+    def recording(originals, simplifieds, dtype=None, tier=None, cache=None):
+        if cache is None:
+            calls.append(list(zip(originals, simplifieds)))
+        return score_pairs(originals, simplifieds, dtype, tier, cache)
+    monkeypatch.setattr(scoring, "score_pairs", recording)
+    return calls
+
+
+def test_hit_miss_round_trip(fake_encoder, cache, computed):
+    first = scoring.score_pairs(ORIGINALS, SIMPLIFIEDS, tier="accurate", cache=cache)
+    # La paire répétée n'est évaluée qu'une fois
+    assert computed == [list(zip(ORIGINALS, SIMPLIFIEDS))[:2]]
+    assert len(cache) == 2
+    second = scoring.score_pairs(ORIGINALS, SIMPLIFIEDS, tier="accurate", cache=cache)
+    assert len(computed) == 1
+    pd.testing.assert_frame_equal(first, second)
+    uncached = scoring.score_pairs(ORIGINALS, SIMPLIFIEDS, tier="accurate")
+    np.testing.assert_allclose(first["score"], uncached["score"])
+
+
+def test_model_change_invalidates_entries(fake_encoder, tmp_path, monkeypatch, computed):
+    for name in ("MODEL_PATH", "PCA_PATH"):
+        copy = tmp_path / getattr(scoring, name)
+        shutil.copy(getattr(scoring, name), copy)
+        monkeypatch.setattr(scoring, name, str(copy))
+    path = str(tmp_path / "predictions.sqlite")
+
+    cache = PredictionCache(path)
+    key = cache.key(ORIGINALS[0], SIMPLIFIEDS[0], "accurate", "float64")
+    scoring.score_pairs(ORIGINALS, SIMPLIFIEDS, tier="accurate", dtype="float64", cache=cache)
+    assert key in cache.get_many([key])
+    cache.close()
+
+    # Même contenu : les entrées restent valides
+    cache = PredictionCache(path)
+    assert cache.key(ORIGINALS[0], SIMPLIFIEDS[0], "accurate", "float64") == key
+    assert len(cache) == 2
+    cache.close()
+
+    with open(scoring.MODEL_PATH, "ab") as f:
+        f.write(b"\0")
+    cache = PredictionCache(path)
+    assert cache.key(ORIGINALS[0], SIMPLIFIEDS[0], "accurate", "float64") != key
+    # Les entrées de l'ancienne version sont supprimées à la première utilisation
+    assert len(cache) == 0
+    scoring.score_pairs(ORIGINALS, SIMPLIFIEDS, tier="accurate", dtype="float64", cache=cache)
+    assert len(computed) == 2
+    cache.close()
+
+
+def test_unscorable_pairs_are_not_stored(fake_encoder, cache, computed):
+    originals = ["", "...", ORIGINALS[0]]
+    simplifieds = ["Le chat dort.", "Le chat dort.", SIMPLIFIEDS[0]]
+    scored = scoring.score_pairs(originals, simplifieds, tier="accurate", cache=cache)
+    assert scored["score"][:2].isna().all() and scored["error"][:2].notna().all()
+    assert len(cache) == 1
+    keys = [cache.key(o, s, "accurate", scoring.FEATURE_DTYPE) for o, s in zip(originals, simplifieds)]
+    assert list(cache.get_many(keys)) == keys[2:]
+    # Elles sont de nouveau évaluées, et de nouveau signalées, au passage suivant
+    again = scoring.score_pairs(originals, simplifieds, tier="accurate", cache=cache)
+    assert computed[-1] == list(zip(originals, simplifieds))[:2]
+    pd.testing.assert_frame_equal(scored, again)
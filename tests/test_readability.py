@@ -0,0 +1,132 @@
+"""Regression tests for the readability package.
+
+Expected values were produced by the original dictionary-based
+implementation of getmeasures."""
+import collections
+import io
+import json
+
+import pytest
+
+import readability
+
+TEXTS = {
+	'en': "And he said : but who is there ?\nI and you went to the shop with him .\n"
+		"But it was closed and we left .",
+	'nl': "En hij zei : maar wie is daar ?\nIk en jij gingen naar de winkel met hem .\n"
+		"Maar het was dicht .",
+	'de': "Und er sagte : aber wer ist da ?\nIch und du gingen mit ihm in den Laden .\n"
+		"Aber er war zu .",
+	'fr': "Et il dit : mais qui est là ?\nJe suis allé au magasin avec lui et elle .\n"
+		"Mais il était fermé .",
+}
+
+# 'word usage' and 'sentence beginnings' of TEXTS; in en, nl and de both
+# categories have a conjunction, pronoun and preposition entry.
+EXPECTED = {
+	'en': ([('tobeverb', 2), ('auxverb', 0), ('conjunction', 5), ('pronoun', 6),
+			('preposition', 4), ('nominalization', 0)],
+		[('pronoun', 1), ('interrogative', 0), ('article', 0),
+			('subordination', 0), ('conjunction', 2), ('preposition', 1)]),
+	'nl': ([('tobeverb', 2), ('auxverb', 0), ('conjunction', 4), ('pronoun', 5),
+			('preposition', 2), ('nominalization', 0)],
+		[('pronoun', 1), ('interrogative', 0), ('article', 0),
+			('subordination', 0), ('conjunction', 2), ('preposition', 0)]),
+	'de': ([('tobeverb', 2), ('auxverb', 0), ('conjunction', 4), ('pronoun', 5),
+			('preposition', 3), ('nominalization', 0)],
+		[('pronoun', 1), ('interrogative', 0), ('article', 0),
+			('subordination', 0), ('conjunction', 2), ('preposition', 0)]),
+	'fr': ([('tobeverb', 3), ('auxverb', 0), ('conjunction', 4),
+			('preposition', 1), ('nominalization', 0), ('subordination', 0),
+			('article', 1)],
+		[('pronoun', 1), ('interrogative', 0)]),
+}
+
+
+@pytest.mark.parametrize('lang', sorted(TEXTS))
+def test_nested_categories(lang):
+	result = readability.getmeasures(TEXTS[lang], lang=lang)
+	assert list(result) == ['readability grades', 'sentence info',
+			'word usage', 'sentence beginnings']
+	wordusage, beginnings = EXPECTED[lang]
+	assert list(result['word usage'].items()) == wordusage
+	assert list(result['sentence beginnings'].items()) == beginnings
+	assert result['sentence info']['sentences'] == 3
+
+
+@pytest.mark.parametrize('lang', sorted(TEXTS))
+def test_merged_matches_nested(lang):
+	# merge=True used to update one dictionary with each category in turn:
+	# a name in two categories keeps its first position and its last value.
+	nested = readability.getmeasures(TEXTS[lang], lang=lang)
+	expected = collections.OrderedDict()
+	for data in nested.values():
+		expected.update(data)
+	merged = readability.getmeasures(TEXTS[lang], lang=lang, merge=True)
+	assert list(merged.items()) == list(expected.items())
+
+	record = readability.getmeasures(TEXTS[lang], lang=lang, record=True)
+	assert len(record) == len(dict(record)) == len(expected)
+	assert list(record.items()) == list(expected.items())
+	assert [type(value) for value in record.values()] == [
+			type(value) for value in expected.values()]
+
+
+@pytest.mark.parametrize('lang', sorted(TEXTS))
+def test_lines_and_string_agree(lang):
+	assert (readability.getmeasures(TEXTS[lang].split('\n'), lang=lang)
+			== readability.getmeasures(TEXTS[lang], lang=lang))
+
+
+def _writefiles(tmp_path):
+	filenames = []
+	for lang in ('en', 'en', 'de'):
+		filename = tmp_path / ('%d.txt' % len(filenames))
+		filename.write_text(TEXTS[lang], encoding='utf8')
+		filenames.append(str(filename))
+	return filenames
+
+
+def _olddataframe(filenames, lang):
+	# The former getdataframe: one merged dictionary per file.
+	pandas = pytest.importorskip('pandas')
+	return pandas.DataFrame([readability.getmeasures(
+			open(name, encoding='utf8').read(), lang=lang, merge=True)
+			for name in filenames], index=filenames)
+
+
+@pytest.mark.parametrize('lang', ['en', 'fr'])
+def test_writecsv_matches_dataframe(tmp_path, lang):
+	filenames = _writefiles(tmp_path)
+	out = io.StringIO()
+	readability.writecsv(readability.itermeasures(filenames, lang=lang), out,
+			lang=lang)
+	expected = _olddataframe(filenames, lang).to_csv(lineterminator='\n')
+	assert out.getvalue() == expected
+	header = out.getvalue().split('\n')[0].split(',')
+	assert len(header) == len(set(header))
+
+
+def test_writejsonl(tmp_path):
+	filenames = _writefiles(tmp_path)
+	out = io.StringIO()
+	readability.writejsonl(readability.itermeasures(filenames), out)
+	rows = [json.loads(line) for line in out.getvalue().splitlines()]
+	expected = _olddataframe(filenames, 'en')
+	assert [row.pop('file') for row in rows] == filenames
+	assert [list(row) for row in rows] == [list(expected.columns)] * len(rows)
+	assert [list(row.values()) for row in rows] == expected.values.tolist()
+
+
+def test_writeparquet_reads_back(tmp_path):
+	pandas = pytest.importorskip('pandas')
+	pytest.importorskip('pyarrow')
+	filenames = _writefiles(tmp_path)
+	path = str(tmp_path / 'out.parquet')
+	readability.writeparquet(readability.itermeasures(filenames), path,
+			chunksize=2)
+	result = pandas.read_parquet(path).set_index('file')
+	expected = _olddataframe(filenames, 'en')
+	assert list(result.columns) == list(expected.columns)
+	assert result.values.tolist() == expected.values.tolist()
+	assert (result.dtypes.values == expected.dtypes.values).all()
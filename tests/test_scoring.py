@@ -0,0 +1,40 @@
+"""Tests for the scoring entry points, with a stand-in encoder."""
+import numpy as np
+import pytest
+
+scoring = pytest.importorskip("scoring")
+
+from extract_readability import DIFF_COLUMNS, EMPTY_TEXT, NO_WORDS
+
+ORIGINAL = "Le chat, qui était très fatigué, dormait sur le canapé."
+
+
+def test_score_candidates_unscorable(fake_encoder):
+    candidates = ["Le chat dormait.", "!!!", "", ORIGINAL, "Le chat fatigué dormait sur le canapé."]
+    ranked = scoring.score_candidates(ORIGINAL, candidates)
+    assert list(ranked.columns) == ["simplified", "score", "error"]
+    assert sorted(ranked.index) == list(range(len(candidates)))
+    # Les candidates non évaluables sont classées en dernier
+    assert list(ranked.index[-2:]) == [1, 2]
+    assert ranked["score"].iloc[:3].notna().all()
+    assert ranked.loc[1, "error"] == NO_WORDS
+    assert ranked.loc[2, "error"] == EMPTY_TEXT
+    assert ranked.loc[3, "score"] == 0.0 and ranked["error"].iloc[:3].isna().all()
+    # Les scores valides sont ceux de score_pairs
+    pairs = scoring.score_pairs([ORIGINAL] * len(candidates), candidates)
+    np.testing.assert_allclose(ranked["score"].sort_index(), pairs["score"], rtol=1e-6)
+
+
+def test_score_candidates_blank_original(fake_encoder):
+    ranked = scoring.score_candidates("  ", ["Le chat dormait.", "  "])
+    assert ranked["score"].isna().all()
+    assert list(ranked["error"]) == [EMPTY_TEXT, EMPTY_TEXT]
+
+
+def test_score_pairs_unscorable(fake_encoder):
+    scored = scoring.score_pairs([ORIGINAL, "", "..."], ["Le chat dormait.", "Le chat dort.", "Le chat dort."])
+    assert list(scored.columns[:4]) == ["original", "simplified", "score", "error"]
+    assert list(scored.columns[4:]) == DIFF_COLUMNS
+    assert np.isfinite(scored["score"][0]) and scored["score"][1:].isna().all()
+    assert list(scored["error"][1:]) == [EMPTY_TEXT, NO_WORDS]
+    assert scored.loc[1:, DIFF_COLUMNS].isna().all().all()
@@ -0,0 +1,101 @@
+"""Tests for the shared-memory ring buffers of shm_transport."""
+import multiprocessing as mp
+import threading
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+import shm_transport
+from shm_transport import SharedRing
+
+SHAPE = (4, 3)
+
+
+def chunk(i, rows=SHAPE[0]):
+    return np.full((rows, SHAPE[1]), i, dtype=np.float32)
+
+
+def produce(ring, n_chunks):
+    for i in range(n_chunks):
+        ring.put(chunk(i, rows=1 + i % SHAPE[0]), meta=i)
+    ring.close_stream()
+
+
+def crash(ring):
+    raise SystemExit(3)
+
+
+def close_child(ring):
+    ring.close()
+
+
+@pytest.fixture
+def ctx():
+    return mp.get_context("spawn")
+
+
+def test_stream_between_processes(ctx):
+    # Plus de blocs que de cases : le producteur attend que les cases soient libérées
+    with SharedRing(2, SHAPE, ctx=ctx) as ring:
+        proc = ctx.Process(target=produce, args=(ring, 7))
+        proc.start()
+        slots = set()
+        for i in range(7):
+            slot, rows, meta = ring.get([proc])
+            assert meta == i
+            np.testing.assert_array_equal(rows, chunk(i, rows=1 + i % SHAPE[0]))
+            slots.add(slot)
+            ring.release(slot)
+        assert ring.get([proc]) is None
+        proc.join()
+        assert proc.exitcode == 0
+        assert slots == {0, 1}
+
+
+def test_put_blocks_until_a_slot_is_released():
+    with SharedRing(2, SHAPE) as ring:
+        ring.put(chunk(0), meta=0)
+        ring.put(chunk(1), meta=1)
+        third = threading.Thread(target=ring.put, args=(chunk(2),), kwargs={"meta": 2})
+        third.start()
+        third.join(0.3)
+        assert third.is_alive()
+        slot, rows, meta = ring.get()
+        assert meta == 0
+        ring.release(slot)
+        third.join(5)
+        assert not third.is_alive()
+        # La case libérée est réutilisée par le troisième bloc
+        assert [ring.get()[2] for _ in range(2)] == [1, 2]
+
+
+def test_rows_over_capacity_are_rejected():
+    with SharedRing(1, SHAPE) as ring:
+        with pytest.raises(ValueError):
+            ring.put(np.zeros((SHAPE[0] + 1, SHAPE[1])))
+
+
+def test_dead_producer_is_reported(ctx, monkeypatch):
+    monkeypatch.setattr(shm_transport, "POLL_SECONDS", 0.05)
+    with SharedRing(2, SHAPE, ctx=ctx) as ring:
+        proc = ctx.Process(target=crash, args=(ring,), name="stage")
+        proc.start()
+        proc.join()
+        with pytest.raises(RuntimeError, match="stage exited with code 3"):
+            ring.get([proc])
+
+
+def test_close_unlinks_only_in_owner(ctx):
+    ring = SharedRing(2, SHAPE, ctx=ctx)
+    name = ring._shm.name
+    # Un processus enfant qui se détache ne détruit pas le bloc
+    proc = ctx.Process(target=close_child, args=(ring,))
+    proc.start()
+    proc.join()
+    assert proc.exitcode == 0
+    attached = shared_memory.SharedMemory(name=name)
+    attached.close()
+    ring.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
@@ -0,0 +1,109 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Préchauffage au démarrage et sonde de disponibilité.
+# La première prédiction d'un processus paie des initialisations paresseuses :
+# allocations de torch, chargement du dictionnaire pyphen, compilation des
+# expressions régulières, croissance du vocabulaire spaCy. warmup() fait passer
+# quelques paires françaises représentatives (courtes et longues) par chaque
+# étape, en paire unique (predict_pair) et par lot (score_pairs), puis marque
+# le processus comme prêt.
+# Une sonde HTTP (serve_readiness) répond 503 sur /ready tant que le
+# préchauffage n'est pas terminé, puis 200 ; /live répond toujours 200. Un
+# répartiteur de charge n'envoie ainsi jamais de requête à une instance froide.
+# Streamlit n'exécute le script de l'application qu'à la première session :
+# serve.py démarre donc la sonde et le préchauffage avec le processus serveur.
+#
+#   python warmup.py               # durées à froid et à chaud
+READINESS_PORT_ENV = "READINESS_PORT"
+
+WARMUP_PAIRS = [
+    ("Le chat, qui était particulièrement fatigué, s'endormit sur le canapé.",
+     "Le chat était fatigué. Il dormit sur le canapé."),
+    ("Nonobstant les intempéries, la manifestation s'est déroulée conformément aux prévisions.",
+     "Malgré la pluie, la fête s'est passée comme prévu."),
+    ("Il convient de souligner que l'administration a procédé à la modification des horaires d'ouverture "
+     "des établissements scolaires, lesquels accueilleront désormais les élèves dès sept heures trente, "
+     "afin de permettre aux parents dont les horaires de travail sont contraignants de déposer leurs "
+     "enfants avant de se rendre à leur emploi.",
+     "L'administration a changé les horaires des écoles. Les élèves pourront arriver à sept heures trente. "
+     "Les parents qui travaillent tôt pourront ainsi déposer leurs enfants."),
+    ("« Viendras-tu demain ? » demanda-t-elle.", "« Tu viens demain ? » dit-elle."),
+]
+
+_ready = threading.Event()
+_warmup_lock = threading.Lock()
+
+def is_ready():
+    return _ready.is_set()
+
+# Passage des paires par chaque étape ; renvoie la durée de chaque passe en
+# secondes. tier : niveau de score à préchauffer (voir scoring.choose_tier) ;
+# le niveau « readability » n'utilise pas l'encodeur et saute predict_pair.
+def warmup(pairs=WARMUP_PAIRS, tier=None):
+    import scoring
+    tier = tier or scoring.SCORING_TIER
+    timings = {}
+    originals, simplifieds = zip(*pairs)
+    if tier != "readability":
+        start = time.perf_counter()
+        for original, simplified in pairs:
+            scoring.predict_pair(original, simplified)
+        timings["predict_pair"] = time.perf_counter() - start
+    start = time.perf_counter()
+    scoring.score_pairs(originals, simplifieds, tier=tier)
+    timings["score_pairs"] = time.perf_counter() - start
+    _ready.set()
+    return timings
+
+# Préchauffage du processus s'il n'a pas encore eu lieu ; un appel concurrent
+# attend la fin du préchauffage en cours au lieu d'en lancer un second
+def ensure_warm(tier=None):
+    with _warmup_lock:
+        if not is_ready():
+            warmup(tier=tier)
+
+class ReadinessHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/live":
+            status = 200
+        elif self.path == "/ready":
+            status = 200 if is_ready() else 503
+        else:
+            status = 404
+        body = {200: b"ok\n", 503: b"warming up\n", 404: b"not found\n"}[status]
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+# Sonde de disponibilité dans un thread ; le port vient de READINESS_PORT à
+# défaut. Renvoie le serveur, ou None si aucun port n'est configuré.
+def serve_readiness(port=None, host="0.0.0.0"):
+    port = port or os.environ.get(READINESS_PORT_ENV)
+    if not port:
+        return None
+    server = ThreadingHTTPServer((host, int(port)), ReadinessHandler)
+    threading.Thread(target=server.serve_forever, name="readiness", daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Durées du préchauffage des modèles, à froid et à chaud.")
+    parser.add_argument("--tier", help="niveau de score à préchauffer")
+    args = parser.parse_args()
+
+    cold = warmup(tier=args.tier)
+    warm = warmup(tier=args.tier)
+    for stage in cold:
+        print(f"{stage}: {cold[stage] * 1000:.0f} ms à froid, {warm[stage] * 1000:.0f} ms à chaud", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()